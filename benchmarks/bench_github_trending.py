@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+GitHub Trending 页面解析微基准
+
+对比完整DOM解析与只构建仓库行的快速解析模式。
+使用真实页面：
+    curl -s https://github.com/trending -o trending.html
+    python benchmarks/bench_github_trending.py --html trending.html
+不指定 --html 时使用结构相近的合成页面。
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from techhorizon.collectors import GitHubTrendingCollector, HTML_PARSER
+
+ROW_TEMPLATE = """
+<article class="Box-row">
+  <div class="float-right d-flex">
+    <div class="BtnGroup"><a class="btn btn-sm BtnGroup-item" href="/login?return_to=%2F{owner}%2F{repo}">
+      <svg aria-hidden="true" height="16" viewBox="0 0 16 16" width="16" class="octicon octicon-star"><path d="M8 .25a.75.75 0 0 1 .673.418l1.882 3.815 4.21.612a.75.75 0 0 1 .416 1.279l-3.046 2.97.719 4.192a.751.751 0 0 1-1.088.791L8 12.347l-3.766 1.98a.75.75 0 0 1-1.088-.79l.72-4.194L.818 6.374a.75.75 0 0 1 .416-1.28l4.21-.611L7.327.668A.75.75 0 0 1 8 .25Z"></path></svg>
+      Star</a></div>
+  </div>
+  <h2 class="h3 lh-condensed">
+    <a data-view-component="true" href="/{owner}/{repo}" class="Link">
+      <svg aria-hidden="true" height="16" viewBox="0 0 16 16" width="16" class="octicon octicon-repo mr-1 color-fg-muted"><path d="M2 2.5A2.5 2.5 0 0 1 4.5 0h8.75a.75.75 0 0 1 .75.75v12.5a.75.75 0 0 1-.75.75h-2.5a.75.75 0 0 1 0-1.5h1.75v-2h-8a1 1 0 0 0-.714 1.7.75.75 0 1 1-1.072 1.05A2.495 2.495 0 0 1 2 11.5Z"></path></svg>
+      <span data-view-component="true" class="text-normal">{owner} /</span>
+      {repo}
+    </a>
+  </h2>
+  <p class="col-9 color-fg-muted my-1 pr-4">{description}</p>
+  <div class="f6 color-fg-muted mt-2">
+    <span class="d-inline-block ml-0 mr-3"><span class="repo-language-color" style="background-color: #3572A5"></span>
+      <span itemprop="programmingLanguage">Python</span></span>
+    <a href="/{owner}/{repo}/stargazers" class="Link Link--muted d-inline-block mr-3">{stars}</a>
+    <a href="/{owner}/{repo}/forks" class="Link Link--muted d-inline-block mr-3">{forks}</a>
+    <span class="d-inline-block mr-3">Built by
+      <a class="d-inline-block" href="/{owner}"><img class="avatar mb-1 avatar-user" src="https://avatars.githubusercontent.com/u/1?s=40&amp;v=4" width="20" height="20" alt="@{owner}"></a>
+    </span>
+    <span class="d-inline-block float-sm-right">{today} stars today</span>
+  </div>
+</article>
+"""
+
+
+def synthetic_trending_page(rows: int = 25) -> str:
+    """生成结构与 github.com/trending 相近的页面：大段页头/脚本/导航 + 仓库行 + 页脚"""
+    head = "<head>" + "".join(
+        f'<link rel="stylesheet" href="https://github.githubassets.com/assets/{i}.css">'
+        f'<script type="application/json" id="data-{i}">{{"key": "{"x" * 400}"}}</script>'
+        for i in range(40)
+    ) + "</head>"
+    nav = "<header><nav>" + "".join(
+        f'<ul class="menu"><li><a class="HeaderMenu-link" href="/features/{i}">Feature {i}</a>'
+        f'<svg height="16" width="16"><path d="M{i} 0h16v16H0Z"></path></svg></li></ul>'
+        for i in range(150)
+    ) + "</nav></header>"
+    body_rows = "".join(
+        ROW_TEMPLATE.format(owner=f"owner{i}", repo=f"project-{i}",
+                            description=f"A fast, modern toolkit number {i} for building things",
+                            stars=1000 + i, forks=100 + i, today=50 + i)
+        for i in range(rows)
+    )
+    footer = "<footer>" + "".join(
+        f'<div class="footer-item"><a href="/site/{i}">Link {i}</a></div>' for i in range(200)
+    ) + "</footer>"
+    return (f"<!DOCTYPE html><html lang=\"en\">{head}<body>{nav}<main><div class=\"Box\">"
+            f"{body_rows}</div></main>{footer}</body></html>")
+
+
+def bench(collector: GitHubTrendingCollector, html: str, iterations: int) -> float:
+    """返回单次解析的平均耗时（毫秒）"""
+    collector.parse_trending(html)  # 预热
+    started = time.perf_counter()
+    for _ in range(iterations):
+        collector.parse_trending(html)
+    return (time.perf_counter() - started) * 1000 / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GitHub Trending 解析微基准')
+    parser.add_argument('--html', help='保存的 github.com/trending 页面')
+    parser.add_argument('--iterations', type=int, default=20, help='每种模式的解析次数')
+    args = parser.parse_args()
+
+    if args.html:
+        with open(args.html, 'r', encoding='utf-8') as f:
+            html = f.read()
+    else:
+        html = synthetic_trending_page()
+
+    full = GitHubTrendingCollector(fast_parse=False)
+    fast = GitHubTrendingCollector(fast_parse=True)
+    assert full.parse_trending(html) == fast.parse_trending(html), "两种模式的解析结果不一致"
+
+    full_ms = bench(full, html, args.iterations)
+    fast_ms = bench(fast, html, args.iterations)
+    print(f"页面大小: {len(html) / 1024:.1f} KB, 仓库行: {len(fast.parse_trending(html))}")
+    print(f"完整DOM (html.parser): {full_ms:.2f} ms/次")
+    print(f"快速模式 ({HTML_PARSER} + SoupStrainer): {fast_ms:.2f} ms/次")
+    print(f"加速比: {full_ms / fast_ms:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+热度评分微基准
+
+对比逐条评分与特征矩阵批量评分（安装 numpy 时使用矩阵乘法），以及用另一组权重（新增数据源和分类）
+对同一矩阵重新评分的耗时。
+默认生成约一个月数据量的合成事件：
+    python benchmarks/bench_scoring.py --events 15000
+"""
+
+import os
+import sys
+import time
+import random
+import copy
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from techhorizon import scoring
+from techhorizon.scoring import DEFAULT_WEIGHTS, ScoringModel
+
+SOURCES = ['github_trending', 'hacker_news', 'readhub', 'oschina', 'juejin', 'security_vuln', 'tech_blogs']
+CATEGORIES = ['ai_ml', 'security', 'web_dev', 'mobile', 'cloud_devops', 'general', 'major_announcement']
+EVENT_TYPES = ['security_alert', 'new_release', 'major_announcement', 'community_discussion']
+
+
+def synthetic_events(count: int):
+    rng = random.Random(0)
+    return [{
+        'source': rng.choice(SOURCES),
+        'primary_category': rng.choice(CATEGORIES),
+        'event_types': rng.sample(EVENT_TYPES, rng.randint(1, 2)),
+    } for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='热度评分微基准')
+    parser.add_argument('--events', type=int, default=15000, help='事件数')
+    args = parser.parse_args()
+
+    events = synthetic_events(args.events)
+    model = ScoringModel()
+
+    started = time.perf_counter()
+    per_event = [model.score_one(event) for event in events]
+    per_event_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    matrix = model.feature_matrix(events)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    batch = model.score_matrix(matrix)
+    matrix_ms = (time.perf_counter() - started) * 1000
+    assert batch == per_event, "批量评分与逐条评分结果不一致"
+
+    # A/B：新增数据源和分类的权重
+    weights = copy.deepcopy(DEFAULT_WEIGHTS)
+    weights['source']['tech_blogs'] = 7
+    weights['category']['cloud_devops'] = 4
+    variant = ScoringModel(weights)
+    started = time.perf_counter()
+    rescored = variant.score_matrix(matrix)
+    rescore_ms = (time.perf_counter() - started) * 1000
+    assert rescored == [variant.score_one(event) for event in events], "重新评分与逐条评分结果不一致"
+
+    print(f"事件数: {len(events)}, 特征列: {len(matrix.columns)}, numpy: {'是' if scoring.np is not None else '否'}")
+    print(f"逐条评分: {per_event_ms:.2f} ms")
+    print(f"构建特征矩阵: {build_ms:.2f} ms")
+    print(f"矩阵评分（含首次构建稠密矩阵）: {matrix_ms:.2f} ms")
+    print(f"按新权重重新评分: {rescore_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+TechHorizon 异步数据收集器模块
+在单个事件循环上并发执行所有数据源及其子请求
+"""
+
+import json
+import asyncio
+from typing import List, Dict, Any, Optional
+
+try:
+    import aiohttp
+except ImportError:  # 可选依赖，未安装时退回到线程池执行同步请求
+    aiohttp = None
+
+from .collectors import (BaseCollector, COLLECTORS, DEFAULT_HEADERS, SOURCE_BUDGETS, SOURCE_LIMITS,
+                         hacker_news_event)
+from .scheduler import BudgetExceeded, Deadline, rate_limiter
+
+
+class AsyncBaseCollector:
+    """异步数据收集器基类"""
+
+    def __init__(self, name: str, max_in_flight: int = 16):
+        self.name = name
+        self.max_in_flight = max_in_flight  # 单个数据源同时在途的子请求数
+        self.session = None  # 由驱动程序注入共享的 aiohttp.ClientSession
+        self.budget = None  # 本次收集的时间预算（Deadline），由驱动程序设置
+        self.truncated = False
+        self._fallback = None
+
+    def out_of_time(self) -> bool:
+        """时间预算是否已用完；用完时标记本次结果为部分结果"""
+        if self.budget is not None and self.budget.expired():
+            self.truncated = True
+        return self.truncated
+
+    def _sync_fallback(self) -> BaseCollector:
+        """未安装aiohttp时使用的同步收集器"""
+        if self._fallback is None:
+            self._fallback = BaseCollector(self.name)
+        return self._fallback
+
+    async def _get_text(self, url: str, timeout: int) -> str:
+        """发起GET请求并返回文本，失败时抛出异常"""
+        await asyncio.sleep(rate_limiter.reserve(url))
+        if self.budget is not None:
+            try:
+                timeout = self.budget.clamp(timeout)
+            except BudgetExceeded:
+                self.truncated = True
+                raise
+
+        if self.session is None:
+            loop = asyncio.get_running_loop()
+            session = self._sync_fallback().session
+
+            def get():
+                response = session.get(url, timeout=timeout)
+                response.raise_for_status()
+                return response.text
+
+            return await loop.run_in_executor(None, get)
+
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        async with self.session.get(url, timeout=client_timeout) as response:
+            response.raise_for_status()
+            return await response.text()
+
+    async def fetch_url(self, url: str, timeout: int = 10) -> str:
+        """获取URL内容"""
+        try:
+            return await self._get_text(url, timeout)
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+            return ""
+
+    async def fetch_json(self, url: str, timeout: int = 10) -> Any:
+        """获取JSON数据"""
+        try:
+            return json.loads(await self._get_text(url, timeout))
+        except Exception as e:
+            print(f"Error fetching JSON from {url}: {e}")
+            return {}
+
+    async def collect(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """收集数据，由子类实现"""
+        raise NotImplementedError
+
+
+class SyncCollectorAdapter(AsyncBaseCollector):
+    """把同步收集器包装为异步收集器，collect() 在线程池中执行"""
+
+    def __init__(self, collector: BaseCollector):
+        super().__init__(collector.name)
+        self.collector = collector
+
+    async def collect(self, limit: int = 20) -> List[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        self.collector.budget = self.budget
+        self.collector.truncated = False
+        try:
+            return await loop.run_in_executor(None, self.collector.collect, limit)
+        finally:
+            self.truncated = self.collector.truncated
+
+
+class AsyncHackerNewsCollector(AsyncBaseCollector):
+    """Hacker News 异步收集器"""
+
+    def __init__(self, max_in_flight: int = 16, min_score: int = 10):
+        super().__init__("hacker_news", max_in_flight)
+        self.api_base = "https://hacker-news.firebaseio.com/v0"
+        self.min_score = min_score
+
+    async def collect(self, limit: int = 35) -> List[Dict[str, Any]]:
+        """收集Hacker News热门话题（协程并发获取条目，保持榜单顺序）"""
+        top_stories = await self.fetch_json(f"{self.api_base}/topstories.json")
+        if not top_stories:
+            return []
+
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        async def fetch_story(story_id):
+            async with semaphore:
+                return await self.fetch_json(f"{self.api_base}/item/{story_id}.json")
+
+        tasks = [asyncio.ensure_future(fetch_story(story_id)) for story_id in top_stories]
+        events = []
+        try:
+            # 按榜单顺序等待，凑满 limit 条后取消其余请求
+            for story_id, task in zip(top_stories, tasks):
+                if self.out_of_time():
+                    break
+                story = await task
+                if not story or story.get('score', 0) <= self.min_score:
+                    continue
+                events.append(hacker_news_event(story, self.name))
+                if len(events) >= limit:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return events
+
+
+def default_async_collectors() -> Dict[str, AsyncBaseCollector]:
+    """默认异步收集器：原生异步实现优先，其余通过适配器复用同步收集器"""
+    native = {
+        'hacker_news': AsyncHackerNewsCollector(),
+    }
+    return {
+        name: native.get(name) or SyncCollectorAdapter(collector)
+        for name, collector in COLLECTORS.items()
+    }
+
+
+async def async_collect_all_sources(collectors: Optional[Dict[str, AsyncBaseCollector]] = None,
+                                    source_limits: Optional[Dict[str, int]] = None,
+                                    deadline: Optional[Deadline] = None,
+                                    truncated_sources: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """在同一个事件循环上并发收集所有数据源；被截断的数据源名追加到 truncated_sources"""
+    collectors = collectors or default_async_collectors()
+    source_limits = source_limits or SOURCE_LIMITS
+    if truncated_sources is None:
+        truncated_sources = []
+
+    async def collect_one(source_name, collector):
+        print(f"Collecting from {source_name}...")
+        collector.truncated = False
+        collector.budget = Deadline(SOURCE_BUDGETS.get(source_name, 120), deadline)
+        try:
+            # 收集器会在预算内自行返回部分结果，这里的超时只是兜底
+            events = await asyncio.wait_for(collector.collect(source_limits.get(source_name, 10)),
+                                            collector.budget.remaining() + 5)
+        except asyncio.TimeoutError:
+            print(f"Gave up waiting for {source_name}: time budget exhausted")
+            collector.truncated = True
+            events = []
+        except Exception as e:
+            print(f"Error collecting from {source_name}: {e}")
+            events = []
+        if collector.truncated or collector.budget.expired():
+            truncated_sources.append(source_name)
+        print(f"Collected {len(events)} events from {source_name}")
+        return events
+
+    async def run_all():
+        results = await asyncio.gather(*[
+            collect_one(source_name, collector)
+            for source_name, collector in collectors.items()
+        ])
+        return [event for events in results for event in events]
+
+    if aiohttp is None:
+        return await run_all()
+
+    headers = dict(DEFAULT_HEADERS)
+    headers['Accept-Encoding'] = 'gzip, deflate'
+    async with aiohttp.ClientSession(headers=headers) as session:
+        for collector in collectors.values():
+            collector.session = session
+        try:
+            return await run_all()
+        finally:
+            for collector in collectors.values():
+                collector.session = None
+
+
+def collect_all_sources_async(source_limits: Optional[Dict[str, int]] = None,
+                              deadline: Optional[Deadline] = None,
+                              truncated_sources: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """同步入口：运行异步收集驱动并返回所有事件"""
+    return asyncio.run(async_collect_all_sources(source_limits=source_limits, deadline=deadline,
+                                                 truncated_sources=truncated_sources))
@@ -3,55 +3,249 @@
 TechHorizon 数据收集器模块 - 修复版（无模拟数据，移除Gitee）
 """
 
+import re
 import json
 import time
 import requests
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from bs4 import BeautifulSoup, SoupStrainer
 import feedparser
+from .http_cache import HTTPCache, http_cache
+from .resilience import CircuitBreaker, RetryPolicy
+from .scheduler import BudgetExceeded, CollectionEngine, Deadline, iter_ordered, rate_limiter
+from .transport import DEFAULT_HEADERS, SessionManager, get_session_manager
+from .urls import absolute_url
+
+# GitHub Advisory 严重程度 -> 数值等级
+SEVERITY_LEVELS = {'low': 1, 'medium': 2, 'moderate': 2, 'high': 3, 'critical': 4}
+
+STARS_TODAY_PATTERN = re.compile(r'([\d,]+)\s+stars?\s+today')
+
+def parse_count(text: str) -> Optional[int]:
+    """解析 "1,234" 形式的计数，无法解析时返回None"""
+    digits = re.sub(r'[^\d]', '', text or '')
+    return int(digits) if digits else None
+
+def unix_to_iso(timestamp: Optional[float]) -> Optional[str]:
+    """Unix时间戳转为UTC ISO时间"""
+    if not timestamp:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+# 不带时区的国内数据源时间按北京时间解释
+CHINA_TZ = timezone(timedelta(hours=8))
+
+def datetime_to_iso(value: Any, default_tz: timezone = CHINA_TZ) -> Optional[str]:
+    """ISO 8601 字符串或Unix时间戳（秒/毫秒）转为UTC ISO时间，无法解析时返回None"""
+    if not value:
+        return None
+    if isinstance(value, (int, float)):
+        return unix_to_iso(value / 1000 if value > 1e11 else value)
+    text = str(value).strip()
+    if text[-1:] in ('Z', 'z'):
+        text = text[:-1] + '+00:00'  # Python 3.11 之前 fromisoformat 不接受 Z 后缀
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=default_tz)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+def entry_published_at(entry) -> Optional[str]:
+    """RSS/Atom条目的发布时间（UTC ISO时间）"""
+    parsed = getattr(entry, 'published_parsed', None) or getattr(entry, 'updated_parsed', None)
+    if not parsed:
+        return None
+    return datetime(*parsed[:6], tzinfo=timezone.utc).isoformat()
+
+def hacker_news_event(story: Dict[str, Any], source: str = "hacker_news") -> Dict[str, Any]:
+    """Hacker News 条目转为事件，分数和评论数作为数值字段保留"""
+    points = story.get('score', 0)
+    comments = story.get('descendants', 0)
+    return {
+        "title": story.get('title', ''),
+        "description": f"Hacker News discussion with {points} points and {comments} comments",
+        "url": absolute_url(story.get('url') or f"https://news.ycombinator.com/item?id={story.get('id')}"),
+        "source": source,
+        "points": points,
+        "comments": comments,
+        "published_at": unix_to_iso(story.get('time')),
+    }
 
 class BaseCollector:
     """数据收集器基类"""
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, cache: Optional[HTTPCache] = None,
+                 session_manager: Optional[SessionManager] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
         self.name = name
-        self.session = requests.Session()
-        # 使用更真实的浏览器User-Agent
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
+        # 所有收集器共享同一个连接池会话，同一主机的连接只建立一次
+        self.session_manager = session_manager or get_session_manager()
+        self.session = self.session_manager.session
+        self.cache = cache or http_cache
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.fetch_errors = 0  # 本次收集中最终失败的请求数，供熔断器判断
+        self.budget = None  # 本次收集的时间预算（Deadline），由收集引擎设置
+        self.truncated = False  # 是否因预算用完而只返回了部分结果
+    
+    def event_url(self, url: str, base: Optional[str] = None) -> str:
+        """事件链接：只解析相对链接，保留原始参数和片段；去重用的规范化链接由 event_id 计算"""
+        return absolute_url(url, base)
+    
+    def out_of_time(self) -> bool:
+        """时间预算是否已用完；用完时标记本次结果为部分结果"""
+        if self.budget is not None and self.budget.expired():
+            self.truncated = True
+        return self.truncated
+    
+    def _get(self, url: str, timeout: int, params: Optional[Dict[str, Any]],
+             headers: Dict[str, str]) -> requests.Response:
+        """按重试策略发起GET请求：连接错误、超时和可重试状态码会退避后重试"""
+        attempt = 0
+        while True:
+            rate_limiter.wait(url)
+            request_timeout = timeout
+            if self.budget is not None:
+                try:
+                    request_timeout = self.budget.clamp(timeout)
+                except BudgetExceeded:
+                    self.truncated = True
+                    raise
+            try:
+                response = self.session.get(url, params=params, timeout=request_timeout, headers=headers)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = self.retry_policy.delay_for(attempt)
+                if delay is None:
+                    raise
+                print(f"Retrying {url} in {delay:.1f}s after error: {e}")
+            else:
+                if not self.retry_policy.is_retryable(response.status_code):
+                    return response
+                delay = self.retry_policy.delay_for(attempt, response)
+                if delay is None:
+                    return response
+                print(f"Retrying {url} in {delay:.1f}s after HTTP {response.status_code}")
+                response.close()
+            if self.budget is not None and delay >= self.budget.remaining():
+                self.truncated = True
+                raise BudgetExceeded(f"no time left to retry {url}")
+            time.sleep(delay)
+            attempt += 1
+    
+    def fetch_content(self, url: str, timeout: int = 10,
+                      params: Optional[Dict[str, Any]] = None) -> Tuple[bytes, Optional[str]]:
+        """条件GET获取原始响应体和编码，未修改(304)时返回缓存内容，失败时抛出异常"""
+        key = self.cache.key_for(url, params)
+        cached = self.cache.load(key)
+        response = self._get(url, timeout, params, self.cache.conditional_headers(cached))
+        if response.status_code == 304 and cached:
+            self.cache.touch(key, cached)
+            return self.cache.read_body(key), cached.get('encoding')
+        
+        response.raise_for_status()
+        self.cache.store(key, url, response)
+        return response.content, response.encoding
     
     def fetch_url(self, url: str, timeout: int = 10) -> str:
         """获取URL内容"""
         try:
-            response = self.session.get(url, timeout=timeout)
-            response.raise_for_status()
-            return response.text
+            content, encoding = self.fetch_content(url, timeout)
+            return content.decode(encoding or 'utf-8', errors='replace')
         except Exception as e:
             print(f"Error fetching {url}: {e}")
+            self.fetch_errors += 1
             return ""
     
-    def fetch_json(self, url: str, timeout: int = 10) -> Dict:
+    def fetch_json(self, url: str, timeout: int = 10,
+                   params: Optional[Dict[str, Any]] = None) -> Any:
         """获取JSON数据"""
         try:
-            response = self.session.get(url, timeout=timeout)
-            response.raise_for_status()
-            return response.json()
+            content, _ = self.fetch_content(url, timeout, params)
+            return json.loads(content)
         except Exception as e:
             print(f"Error fetching JSON from {url}: {e}")
+            self.fetch_errors += 1
             return {}
+    
+    def collect(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """收集数据，由子类实现 collect() 或 iter_collect() 之一"""
+        # 两者默认互相调用，都未重写时直接报错而不是无限递归
+        if type(self).iter_collect is BaseCollector.iter_collect:
+            raise NotImplementedError(f"{type(self).__name__} must implement collect() or iter_collect()")
+        return list(self.iter_collect(limit))
+    
+    def iter_collect(self, limit: int = 20) -> Iterator[Dict[str, Any]]:
+        """逐条产出事件；默认实现包装 collect()，支持边解析边产出的子类应重写此方法"""
+        yield from self.collect(limit)
+    
+    def fetch_feed(self, url: str, timeout: int = 10):
+        """通过共享会话下载RSS/Atom（带超时和条件GET缓存），再交给feedparser解析原始字节"""
+        try:
+            content, _ = self.fetch_content(url, timeout)
+        except Exception as e:
+            print(f"Error fetching feed {url}: {e}")
+            self.fetch_errors += 1
+            content = b""
+        
+        # 编码交由feedparser根据XML声明识别，content-location用于解析相对链接
+        return feedparser.parse(content, response_headers={'content-location': url})
+
+def _default_html_parser() -> str:
+    """优先使用更快的lxml解析器，未安装时退回到标准库html.parser"""
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+HTML_PARSER = _default_html_parser()
+
+# 只为 <article> 节点建树（Trending 页面的仓库行），跳过页头、导航和页脚
+TRENDING_ROW_STRAINER = SoupStrainer('article')
 
 class GitHubTrendingCollector(BaseCollector):
     """GitHub Trending 收集器"""
     
-    def __init__(self):
+    def __init__(self, fast_parse: bool = True):
         super().__init__("github_trending")
+        self.fast_parse = fast_parse  # 只解析仓库行；False 时构建完整DOM
+    
+    def parse_trending(self, html: str, limit: int = 30) -> List[Dict[str, Any]]:
+        """从Trending页面HTML中解析仓库行"""
+        if self.fast_parse:
+            soup = BeautifulSoup(html, HTML_PARSER, parse_only=TRENDING_ROW_STRAINER)
+        else:
+            soup = BeautifulSoup(html, 'html.parser')
+        repo_items = soup.find_all('article', class_='Box-row', limit=limit)
+        
+        events = []
+        for item in repo_items:
+            title_elem = item.find('h2', class_='h3')
+            if title_elem:
+                link = title_elem.find('a')
+                if link and link.get('href'):
+                    title = link.get_text(strip=True).replace('\n', '').replace(' ', '')
+                    full_url = self.event_url(link.get('href'), "https://github.com/")
+                    
+                    desc_elem = item.find('p', class_='col-9')
+                    description = desc_elem.get_text(strip=True) if desc_elem else ""
+                    
+                    stars_elem = item.find('a', href=lambda href: bool(href) and href.endswith('/stargazers'))
+                    stars_today = STARS_TODAY_PATTERN.search(item.get_text(' ', strip=True))
+                    
+                    event = {
+                        "title": title,
+                        "description": description,
+                        "url": full_url,
+                        "source": self.name,
+                        "stars": parse_count(stars_elem.get_text()) if stars_elem else None,
+                        "stars_today": parse_count(stars_today.group(1)) if stars_today else None
+                    }
+                    events.append(event)
+        
+        return events
     
     def collect(self, limit: int = 30) -> List[Dict[str, Any]]:
         """收集GitHub热门项目"""
@@ -61,30 +255,7 @@ class GitHubTrendingCollector(BaseCollector):
             if not html:
                 return []
             
-            soup = BeautifulSoup(html, 'html.parser')
-            repo_items = soup.find_all('article', class_='Box-row', limit=limit)
-            
-            events = []
-            for item in repo_items:
-                title_elem = item.find('h2', class_='h3')
-                if title_elem:
-                    link = title_elem.find('a')
-                    if link and link.get('href'):
-                        title = link.get_text(strip=True).replace('\n', '').replace(' ', '')
-                        full_url = f"https://github.com{link.get('href')}"
-                        
-                        desc_elem = item.find('p', class_='col-9')
-                        description = desc_elem.get_text(strip=True) if desc_elem else ""
-                        
-                        event = {
-                            "title": title,
-                            "description": description,
-                            "url": full_url,
-                            "source": self.name
-                        }
-                        events.append(event)
-            
-            return events
+            return self.parse_trending(html, limit)
         except Exception as e:
             print(f"Error collecting GitHub Trending: {e}")
             return []
@@ -92,35 +263,36 @@ class GitHubTrendingCollector(BaseCollector):
 class HackerNewsCollector(BaseCollector):
     """Hacker News 收集器"""
     
-    def __init__(self):
+    def __init__(self, max_in_flight: int = 8, min_score: int = 10):
         super().__init__("hacker_news")
         self.api_base = "https://hacker-news.firebaseio.com/v0"
+        self.max_in_flight = max_in_flight  # 同时在途的条目请求数
+        self.min_score = min_score
+    
+    def fetch_story(self, story_id: int) -> Dict[str, Any]:
+        """获取单条故事详情"""
+        return self.fetch_json(f"{self.api_base}/item/{story_id}.json")
     
-    def collect(self, limit: int = 35) -> List[Dict[str, Any]]:
-        """收集Hacker News热门话题"""
+    def iter_collect(self, limit: int = 35) -> Iterator[Dict[str, Any]]:
+        """收集Hacker News热门话题（并发获取条目，保持榜单顺序，逐条产出）"""
         try:
             top_stories = self.fetch_json(f"{self.api_base}/topstories.json")
             if not top_stories:
-                return []
+                return
             
-            events = []
-            for story_id in top_stories[:limit]:
-                story = self.fetch_json(f"{self.api_base}/item/{story_id}.json")
-                if story and story.get('score', 0) > 10:
-                    event = {
-                        "title": story.get('title', ''),
-                        "description": f"Hacker News discussion with {story.get('score', 0)} points and {story.get('descendants', 0)} comments",
-                        "url": story.get('url', f"https://news.ycombinator.com/item?id={story_id}"),
-                        "source": self.name
-                    }
-                    events.append(event)
-                    if len(events) >= limit:
-                        break
+            stories = iter_ordered(
+                self.fetch_story,
+                top_stories,
+                lambda story: bool(story) and story.get('score', 0) > self.min_score,
+                limit,
+                max_in_flight=self.max_in_flight,
+                should_stop=self.out_of_time,
+            )
             
-            return events
+            for story in stories:
+                yield hacker_news_event(story, self.name)
         except Exception as e:
             print(f"Error collecting Hacker News: {e}")
-            return []
 
 class ReadHubCollector(BaseCollector):
     """ReadHub 收集器"""
@@ -140,8 +312,9 @@ class ReadHubCollector(BaseCollector):
                 event = {
                     "title": news.get('title', ''),
                     "description": news.get('summary', ''),
-                    "url": news.get('url', ''),
-                    "source": self.name
+                    "url": self.event_url(news.get('url', '')),
+                    "source": self.name,
+                    "published_at": datetime_to_iso(news.get('publishDate'))
                 }
                 events.append(event)
             
@@ -156,35 +329,32 @@ class OSChinaCollector(BaseCollector):
     def __init__(self):
         super().__init__("oschina")
     
-    def collect(self, limit: int = 20) -> List[Dict[str, Any]]:
-        """通过RSS收集开源中国数据"""
+    def iter_collect(self, limit: int = 20) -> Iterator[Dict[str, Any]]:
+        """通过RSS收集开源中国数据，使用第一个有内容的RSS源"""
         rss_sources = [
             'https://www.oschina.net/news/rss',
             'https://www.oschina.net/blog/rss',
         ]
         
         for rss_url in rss_sources:
+            if self.out_of_time():
+                break
             try:
-                feed = feedparser.parse(rss_url)
-                if hasattr(feed, 'entries') and feed.entries:
-                    events = []
-                    for entry in feed.entries[:limit]:
-                        event = {
-                            "title": getattr(entry, 'title', ''),
-                            "description": getattr(entry, 'summary', getattr(entry, 'description', '')),
-                            "url": getattr(entry, 'link', ''),
-                            "source": self.name
-                        }
-                        events.append(event)
-                    
-                    if events:
-                        return events
-                        
+                feed = self.fetch_feed(rss_url)
             except Exception as e:
                 print(f"Error with OSChina RSS {rss_url}: {e}")
                 continue
-        
-        return []
+            
+            if hasattr(feed, 'entries') and feed.entries:
+                for entry in feed.entries[:limit]:
+                    yield {
+                        "title": getattr(entry, 'title', ''),
+                        "description": getattr(entry, 'summary', getattr(entry, 'description', '')),
+                        "url": self.event_url(getattr(entry, 'link', ''), rss_url),
+                        "source": self.name,
+                        "published_at": entry_published_at(entry)
+                    }
+                return
 
 class JuejinCollector(BaseCollector):
     """掘金收集器"""
@@ -219,15 +389,16 @@ class SecurityVulnCollector(BaseCollector):
             url = "https://api.github.com/advisories"
             params = {'per_page': min(limit, 20)}
             
-            response = self.session.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                advisories = response.json()
+            advisories = self.fetch_json(url, params=params)
+            if isinstance(advisories, list):
                 for advisory in advisories[:limit]:
                     event = {
                         "title": f"[CVE] {advisory.get('summary', '')}",
                         "description": advisory.get('description', ''),
-                        "url": advisory.get('html_url', ''),
-                        "source": self.name
+                        "url": self.event_url(advisory.get('html_url', '')),
+                        "source": self.name,
+                        "severity": SEVERITY_LEVELS.get((advisory.get('severity') or '').lower()),
+                        "published_at": datetime_to_iso(advisory.get('published_at'), timezone.utc)
                     }
                     events.append(event)
             # 如果认证失败或其他错误，直接返回空列表
@@ -243,8 +414,8 @@ class TechBlogsCollector(BaseCollector):
     def __init__(self):
         super().__init__("tech_blogs")
     
-    def collect(self, limit: int = 15) -> List[Dict[str, Any]]:
-        """收集各大厂技术博客"""
+    def iter_collect(self, limit: int = 15) -> Iterator[Dict[str, Any]]:
+        """收集各大厂技术博客，每个博客源下载解析后立即产出"""
         blog_sources = [
             {
                 'name': 'Microsoft Research',
@@ -273,39 +444,38 @@ class TechBlogsCollector(BaseCollector):
             }
         ]
         
-        events = []
+        count = 0
         for source in blog_sources:
+            if self.out_of_time() or count >= limit:
+                break
+            if not source['is_rss']:
+                continue
             try:
-                if source['is_rss']:
-                    feed = feedparser.parse(source['url'])
-                    if hasattr(feed, 'entries'):
-                        for entry in feed.entries[:3]:  # 每个源取3条
-                            title = getattr(entry, 'title', '')
-                            # 添加中英双语标题格式
-                            bilingual_title = f"[翻译] [{source['name']}] {title}（{title}）"
-                            
-                            description = getattr(entry, 'summary', getattr(entry, 'description', ''))
-                            url = getattr(entry, 'link', '')
-                            
-                            event = {
-                                "title": bilingual_title,
-                                "description": f"[翻译] {description}",
-                                "url": url,
-                                "source": self.name
-                            }
-                            events.append(event)
-                            
-                            if len(events) >= limit:
-                                break
-                
-                if len(events) >= limit:
-                    break
-                    
+                feed = self.fetch_feed(source['url'])
+                entries = feed.entries[:3] if hasattr(feed, 'entries') else []  # 每个源取3条
             except Exception as e:
                 print(f"Error collecting from {source['name']}: {e}")
                 continue
-        
-        return events[:limit]
+            
+            for entry in entries:
+                title = getattr(entry, 'title', '')
+                # 添加中英双语标题格式
+                bilingual_title = f"[翻译] [{source['name']}] {title}（{title}）"
+                
+                description = getattr(entry, 'summary', getattr(entry, 'description', ''))
+                url = self.event_url(getattr(entry, 'link', ''), source['url'])
+                
+                yield {
+                    "title": bilingual_title,
+                    "description": f"[翻译] {description}",
+                    "url": url,
+                    "source": self.name,
+                    "published_at": entry_published_at(entry)
+                }
+                count += 1
+                
+                if count >= limit:
+                    break
 
 # 导出所有收集器（已移除Gitee）
 COLLECTORS = {
@@ -318,27 +488,35 @@ COLLECTORS = {
     'tech_blogs': TechBlogsCollector(),
 }
 
-def collect_all_sources() -> List[Dict[str, Any]]:
-    """从所有数据源收集数据（已移除Gitee）"""
-    all_events = []
-    
-    # 配置每个数据源的收集数量（调整后保持总量平衡）
-    source_limits = {
-        'github_trending': 30,      # 增加5条
-        'hacker_news': 35,          # 增加5条  
-        'readhub': 25,              # 增加5条
-        'oschina': 20,              # 增加5条
-        'juejin': 20,               # 增加5条（需要修复API）
-        'security_vuln': 20,        # 保持不变
-        'tech_blogs': 15,           # 增加5条
-    }
-    
-    for source_name, collector in COLLECTORS.items():
-        print(f"Collecting from {source_name}...")
-        limit = source_limits.get(source_name, 10)
-        events = collector.collect(limit)
-        all_events.extend(events)
-        print(f"Collected {len(events)} events from {source_name}")
-        time.sleep(1)  # 避免请求过于频繁
-    
-    return all_events
\ No newline at end of file
+# 每个数据源的收集数量（调整后保持总量平衡）
+SOURCE_LIMITS = {
+    'github_trending': 30,      # 增加5条
+    'hacker_news': 35,          # 增加5条  
+    'readhub': 25,              # 增加5条
+    'oschina': 20,              # 增加5条
+    'juejin': 20,               # 增加5条（需要修复API）
+    'security_vuln': 20,        # 保持不变
+    'tech_blogs': 15,           # 增加5条
+}
+
+# 每个数据源的时间预算（秒），未列出的使用引擎默认值
+SOURCE_BUDGETS = {
+    'github_trending': 60,
+    'hacker_news': 90,
+    'readhub': 45,
+    'oschina': 45,
+    'juejin': 45,
+    'security_vuln': 45,
+    'tech_blogs': 90,
+}
+
+def create_engine(max_workers: int = 8, queue_size: int = 0) -> CollectionEngine:
+    """创建默认配置的并行收集引擎"""
+    return CollectionEngine(COLLECTORS, SOURCE_LIMITS, max_workers=max_workers,
+                            breaker=CircuitBreaker(), source_budgets=SOURCE_BUDGETS,
+                            queue_size=queue_size)
+
+def collect_all_sources(max_workers: int = 8,
+                        deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+    """从所有数据源并行收集数据（已移除Gitee），礼貌性由按主机限速保证"""
+    return create_engine(max_workers).run(deadline)
@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any
 from bs4 import BeautifulSoup
 import feedparser
+from .scheduler import CollectionEngine, rate_limiter
 
 class BaseCollector:
     """数据收集器基类"""
@@ -30,6 +31,7 @@ class BaseCollector:
     def fetch_url(self, url: str, timeout: int = 10) -> str:
         """获取URL内容"""
         try:
+            rate_limiter.wait(url)
             response = self.session.get(url, timeout=timeout)
             response.raise_for_status()
             return response.text
@@ -40,6 +42,7 @@ class BaseCollector:
     def fetch_json(self, url: str, timeout: int = 10) -> Dict:
         """获取JSON数据"""
         try:
+            rate_limiter.wait(url)
             response = self.session.get(url, timeout=timeout)
             response.raise_for_status()
             return response.json()
@@ -219,6 +222,7 @@ class SecurityVulnCollector(BaseCollector):
             url = "https://api.github.com/advisories"
             params = {'per_page': min(limit, 20)}
             
+            rate_limiter.wait(url)
             response = self.session.get(url, params=params, timeout=10)
             if response.status_code == 200:
                 advisories = response.json()
@@ -319,10 +323,8 @@ COLLECTORS = {
     'tech_blogs': TechBlogsCollector(),
 }
 
-def collect_all_sources() -> List[Dict[str, Any]]:
+def collect_all_sources(max_workers: int = 8) -> List[Dict[str, Any]]:
     """从所有数据源收集数据（移除Gitee）"""
-    all_events = []
-    
     # 配置每个数据源的收集数量（调整后总计约145条/天）
     source_limits = {
         'github_trending': 30,      # +5
@@ -334,12 +336,5 @@ def collect_all_sources() -> List[Dict[str, Any]]:
         'tech_blogs': 15,           # +5
     }
     
-    for source_name, collector in COLLECTORS.items():
-        print(f"Collecting from {source_name}...")
-        limit = source_limits.get(source_name, 10)
-        events = collector.collect(limit)
-        all_events.extend(events)
-        print(f"Collected {len(events)} events from {source_name}")
-        time.sleep(1)  # 避免请求过于频繁
-    
-    return all_events
\ No newline at end of file
+    engine = CollectionEngine(COLLECTORS, source_limits, max_workers=max_workers)
+    return engine.run()
\ No newline at end of file
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+TechHorizon 跨运行去重模块
+记录保留期内已输出过的事件ID，无需重新加载旧的每日数据即可识别重复事件
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+
+
+class DedupIndex:
+    """
+    持久化的去重索引：event_id -> 首次出现日期（YYYY-MM-DD）。
+    作为流水线阶段使用时，为事件标记 first_seen / seen_before；
+    drop_seen=True 时直接丢弃之前某天已输出过的事件。
+    """
+
+    def __init__(self, index_file: str = ".techhorizon/metadata/dedup_index.json",
+                 window_days: int = 30, drop_seen: bool = False, today: Optional[str] = None):
+        self.index_file = index_file
+        self.window_days = window_days
+        self.drop_seen = drop_seen
+        self.today = today or datetime.now().strftime('%Y-%m-%d')
+        self.cutoff = (datetime.strptime(self.today, '%Y-%m-%d')
+                       - timedelta(days=window_days)).strftime('%Y-%m-%d')
+        self.seen_before = 0
+        self._lock = threading.Lock()
+        self.entries = self._load()
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('events', {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def first_seen(self, event_id: str) -> Optional[str]:
+        """保留窗口内事件首次出现的日期，未出现过返回None"""
+        first_seen = self.entries.get(event_id)
+        return first_seen if first_seen and first_seen >= self.cutoff else None
+
+    def __call__(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            first_seen = self.first_seen(event['event_id']) or self.today
+            self.entries[event['event_id']] = first_seen
+        event['first_seen'] = first_seen
+        event['seen_before'] = first_seen < self.today
+        if event['seen_before']:
+            with self._lock:
+                self.seen_before += 1
+            if self.drop_seen:
+                return None
+        return event
+
+    def prune(self) -> int:
+        """删除超出保留窗口的条目，返回删除数量"""
+        with self._lock:
+            expired = [key for key, day in self.entries.items() if day < self.cutoff]
+            for key in expired:
+                del self.entries[key]
+        return len(expired)
+
+    def save(self):
+        """淘汰过期条目后保存索引"""
+        self.prune()
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.index_file) or '.', exist_ok=True)
+                with open(self.index_file, 'w', encoding='utf-8') as f:
+                    json.dump({'window_days': self.window_days, 'events': self.entries}, f)
+            except OSError as e:
+                print(f"Failed to save dedup index: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'indexed_events': len(self.entries),
+            'seen_before': self.seen_before,
+        }
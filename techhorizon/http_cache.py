@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+TechHorizon HTTP条件请求缓存模块
+在 .techhorizon/cache 下保存 ETag/Last-Modified 校验值和响应体
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+from urllib.parse import urlencode
+
+
+class HTTPCache:
+    """基于磁盘的HTTP条件请求缓存，按TTL和总大小淘汰"""
+
+    def __init__(self, cache_dir: str = ".techhorizon/cache/http",
+                 max_bytes: int = 50 * 1024 * 1024, ttl_days: int = 7):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl_days = ttl_days
+        self._lock = threading.Lock()
+
+    def key_for(self, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """根据实际请求的URL和查询参数生成缓存键（不做规范化：去掉的参数可能改变响应内容）"""
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()))}"
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.body")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存元数据，不存在或已损坏时返回None"""
+        try:
+            with open(self._meta_path(key), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self._body_path(key)):
+            return None
+        return meta
+
+    def read_body(self, key: str) -> bytes:
+        """读取缓存的响应体"""
+        with open(self._body_path(key), 'rb') as f:
+            return f.read()
+
+    def conditional_headers(self, meta: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """根据缓存元数据生成 If-None-Match / If-Modified-Since 请求头"""
+        headers = {}
+        if not meta:
+            return headers
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def _write_meta(self, key: str, meta: Dict[str, Any]):
+        tmp_path = f"{self._meta_path(key)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, self._meta_path(key))
+
+    def store(self, key: str, url: str, response) -> bool:
+        """保存带校验值的响应，没有 ETag/Last-Modified 的响应不缓存"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return False
+
+        body = response.content
+        now = time.time()
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'encoding': response.encoding,
+            'size': len(body),
+            'stored_at': now,
+            'last_used': now,
+        }
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self._body_path(key)}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, self._body_path(key))
+            self._write_meta(key, meta)
+        except OSError as e:
+            print(f"Failed to cache {url}: {e}")
+            return False
+        return True
+
+    def touch(self, key: str, meta: Dict[str, Any]):
+        """304 命中后刷新校验时间"""
+        now = time.time()
+        meta['stored_at'] = now
+        meta['last_used'] = now
+        try:
+            self._write_meta(key, meta)
+        except OSError as e:
+            print(f"Failed to refresh cache entry {key}: {e}")
+
+    def evict(self, ttl_days: Optional[int] = None, max_bytes: Optional[int] = None) -> int:
+        """淘汰超过TTL的条目，再按最近使用时间淘汰直到总大小不超过上限"""
+        ttl_days = self.ttl_days if ttl_days is None else ttl_days
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        if not os.path.isdir(self.cache_dir):
+            return 0
+
+        with self._lock:
+            cutoff = time.time() - ttl_days * 86400
+            entries = []
+            removed = 0
+            filenames = set(os.listdir(self.cache_dir))
+            for filename in filenames:
+                # 清理缺少元数据的孤立响应体
+                if filename.endswith('.body') and f"{filename[:-len('.body')]}.json" not in filenames:
+                    self._remove(filename[:-len('.body')])
+                if not filename.endswith('.json'):
+                    continue
+                key = filename[:-len('.json')]
+                meta = self.load(key)
+                if meta is None or meta.get('stored_at', 0) < cutoff:
+                    self._remove(key)
+                    removed += 1
+                    continue
+                entries.append((meta.get('last_used', 0), meta.get('size', 0), key))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, key in sorted(entries):
+                if total <= max_bytes:
+                    break
+                self._remove(key)
+                total -= size
+                removed += 1
+
+        return removed
+
+    def _remove(self, key: str):
+        for path in (self._meta_path(key), self._body_path(key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Failed to delete cache file {path}: {e}")
+
+
+# 进程内共享的HTTP缓存，所有收集器共用
+http_cache = HTTPCache()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+TechHorizon 关键词匹配模块
+Aho-Corasick 多模式自动机：一次扫描文本即可匹配全部关键词
+"""
+
+from collections import deque
+from typing import List, Dict, Any, Hashable, Set
+
+
+# 4个字符以上的英文关键词允许的词尾变化（release → releases/released）
+WORD_SUFFIXES = ('s', 'es', 'ed', 'd', 'ing')
+
+
+def is_word_char(char: str) -> bool:
+    """ASCII字母数字视为单词字符；中文等其他字符都视为单词边界"""
+    return char.isascii() and char.isalnum()
+
+
+class KeywordAutomaton:
+    """
+    关键词自动机（大小写不敏感）。
+    以ASCII字母数字开头/结尾的关键词在对应一侧要求单词边界（'go' 不匹配 'good'，
+    'AI' 不匹配 'said'），中文一侧按子串匹配。4个字符以上的关键词允许常见词尾变化
+    （s/es/ed/d/ing，以及 y → ies/ied、e → ing），全大写缩写允许复数 s（CVEs、LLMs），
+    其余短关键词必须完整匹配（'new' 不匹配 'news'）。
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[tuple]] = [[]]
+        self._built = False
+
+    @staticmethod
+    def _variants(keyword: str):
+        """关键词的各个匹配形式及其后允许的词尾"""
+        lowered = keyword.lower()
+        if not lowered[-1].isascii() or not lowered[-1].isalpha():
+            return [(lowered, ())]
+        if len(lowered) >= 4:
+            variants = [(lowered, WORD_SUFFIXES)]
+            if lowered.endswith('y'):
+                variants += [(lowered[:-1] + 'ies', ()), (lowered[:-1] + 'ied', ())]
+            elif lowered.endswith('e'):
+                variants.append((lowered[:-1] + 'ing', ()))
+            return variants
+        if keyword.isupper():
+            return [(lowered, ('s',))]
+        return [(lowered, ())]
+
+    def add(self, keyword: str, payload: Hashable):
+        """添加关键词，匹配时返回 payload"""
+        if not keyword:
+            return
+        for pattern, suffixes in self._variants(keyword):
+            self._add_pattern(pattern, suffixes, payload)
+        self._built = False
+
+    def _add_pattern(self, keyword: str, suffixes: tuple, payload: Hashable):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(keyword), is_word_char(keyword[0]), is_word_char(keyword[-1]),
+                                    suffixes, payload))
+
+    def build(self):
+        """按广度优先计算失败指针"""
+        pending = deque()
+        for next_state in self._goto[0].values():
+            self._fail[next_state] = 0
+            pending.append(next_state)
+
+        while pending:
+            state = pending.popleft()
+            for char, next_state in self._goto[state].items():
+                pending.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+        self._built = True
+
+    @staticmethod
+    def _boundary_ok(text: str, start: int, end: int, check_start: bool, check_end: bool,
+                     suffixes: tuple) -> bool:
+        if check_start and start > 0 and is_word_char(text[start - 1]):
+            return False
+        if check_end and end < len(text) and is_word_char(text[end]):
+            # 允许的词尾变化之后必须是单词边界，如 release → released
+            return any(text.startswith(suffix, end)
+                       and (end + len(suffix) == len(text) or not is_word_char(text[end + len(suffix)]))
+                       for suffix in suffixes)
+        return True
+
+    def search(self, text: str) -> Set[Any]:
+        """扫描一次文本，返回所有命中关键词的 payload 集合"""
+        if not self._built:
+            self.build()
+
+        text = text.lower()
+        found = set()
+        state = 0
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, check_start, check_end, suffixes, payload in output[state]:
+                if payload in found:
+                    continue
+                start = index + 1 - length
+                if self._boundary_ok(text, start, index + 1, check_start, check_end, suffixes):
+                    found.add(payload)
+        return found
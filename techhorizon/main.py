@@ -7,58 +7,198 @@ import sys
 import json
 import argparse
 from datetime import datetime, timedelta
-from .collectors import collect_all_sources
-from .processor import DataProcessor
-from .storage import DataStorage
+from .collectors import create_engine
+from .dedup import DedupIndex
+from .near_dup import NearDuplicateDetector
+from .pipeline import Pipeline, Stage
+from .processor import DataProcessor, DuplicateFilter
+from .scheduler import Deadline
+from .scoring import ScoringModel
+from .translation import BatchTranslator, DictionaryBackend, HTTPBackend
+from .storage import DataStorage, EventLogStorage, SQLiteStorage
+
+# 总时限中留给收集阶段的比例，其余留给处理和保存
+COLLECTION_SHARE = 0.8
+
+# 流水线各阶段的工作线程数和阶段间队列容量
+PIPELINE_WORKERS = {
+    'parse': 1,
+    'classify': 2,
+    'score': 1,
+    'translate': 4,
+}
+PIPELINE_QUEUE_SIZE = 64
+TRANSLATE_BATCH_SIZE = 32
+SCORE_BATCH_SIZE = 64
+
+# 周报/月报中的热门事件数
+WEEKLY_TOP_EVENTS = 10
+MONTHLY_TOP_EVENTS = 20
+
+def parse_stage_workers(value):
+    """解析 --stage-workers 参数，如 "translate=8,classify=2" """
+    workers = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        name, _, count = item.partition('=')
+        workers[name.strip()] = int(count)
+    return workers
+
+def positive_int(value):
+    """解析必须为正整数的参数"""
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"必须为正整数: {value}")
+    return number
 
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description='TechHorizon - IT/编程/科技技术界情报收集分析')
-    parser.add_argument('--mode', choices=['daily', 'weekly', 'monthly'], 
+    parser.add_argument('--mode', choices=['daily', 'weekly', 'monthly', 'yearly'], 
                        default='daily', help='运行模式')
     parser.add_argument('--output', help='输出文件路径')
+    parser.add_argument('--engine', choices=['threads', 'async'],
+                       default='threads', help='收集引擎：线程池或asyncio事件循环')
+    parser.add_argument('--deadline', type=float,
+                       help='每日收集的总时限（秒），超时的数据源只返回部分结果')
+    parser.add_argument('--stage-workers', type=parse_stage_workers, default={},
+                       help='流水线各阶段工作线程数，如 translate=8,classify=2')
+    parser.add_argument('--translator-endpoint',
+                       help='HTTP翻译服务地址（POST {"texts": [...]}），默认使用内置模拟翻译')
+    parser.add_argument('--translate-batch-size', type=int, default=TRANSLATE_BATCH_SIZE,
+                       help='每批翻译的文本数')
+    parser.add_argument('--translate-concurrency', type=int, default=4,
+                       help='同时进行的翻译批次数')
+    parser.add_argument('--top-n', type=int,
+                       help='只翻译热度最高的前N条事件（其余保留原文），默认全部翻译')
+    parser.add_argument('--skip-seen', action='store_true',
+                       help='丢弃之前某天已输出过的事件（默认只标记 seen_before）')
+    parser.add_argument('--storage', choices=['json', 'sqlite', 'jsonl'], default='json',
+                       help='每日数据存储后端：每天一个JSON文件、带索引的SQLite数据库，'
+                            '或追加写的JSONL事件日志（同一天多次运行按 event_id 合并）')
+    parser.add_argument('--top-events', type=positive_int,
+                       help=f'周报/月报中的热门事件数（默认 {WEEKLY_TOP_EVENTS}/{MONTHLY_TOP_EVENTS}），'
+                            '超过每日汇总保留的数量时流式扫描每日数据')
+    parser.add_argument('--scoring-weights',
+                       help='热度评分权重配置（JSON），默认读取 .techhorizon/config/scoring_weights.json')
     args = parser.parse_args()
     
     # 初始化组件
-    processor = DataProcessor()
-    storage = DataStorage()
+    backend = HTTPBackend(args.translator_endpoint) if args.translator_endpoint else DictionaryBackend()
+    translator = BatchTranslator(backend, batch_size=args.translate_batch_size,
+                                 concurrency=args.translate_concurrency)
+    processor = DataProcessor(translator=translator,
+                              scoring_model=ScoringModel.from_config(args.scoring_weights))
+    storage_backends = {'json': DataStorage, 'sqlite': SQLiteStorage, 'jsonl': EventLogStorage}
+    storage = storage_backends[args.storage]()
     
     if args.mode == 'daily':
-        run_daily_collection(processor, storage, args.output)
+        run_daily_collection(processor, storage, args.output, engine=args.engine,
+                             deadline=args.deadline, stage_workers=args.stage_workers,
+                             top_n=args.top_n, skip_seen=args.skip_seen)
     elif args.mode == 'weekly':
-        run_weekly_analysis(processor, storage, args.output)
+        run_weekly_analysis(processor, storage, args.output, args.top_events or WEEKLY_TOP_EVENTS)
     elif args.mode == 'monthly':
-        run_monthly_analysis(processor, storage, args.output)
+        run_monthly_analysis(processor, storage, args.output, args.top_events or MONTHLY_TOP_EVENTS)
+    elif args.mode == 'yearly':
+        run_yearly_analysis(processor, storage, args.output)
+
+def build_daily_pipeline(processor, stage_workers=None, queue_size=PIPELINE_QUEUE_SIZE, translate=True):
+    """
+    构建每日流水线：parse → classify → score → translate（fetch 为输入源，sink 为调用方）。
+    分类和评分基于原文；translate=False 时省略翻译阶段，由调用方排序后只翻译需要输出的事件。
+    去重不在流水线中进行：事件到达顺序取决于线程调度，需由调用方排序后再去重，保证留下热度最高的一条。
+    """
+    workers = dict(PIPELINE_WORKERS)
+    workers.update(stage_workers or {})
+    stage_funcs = [
+        ('parse', processor.parse_event, 1),
+        ('classify', processor.apply_classification, 1),
+        ('score', processor.score_events, SCORE_BATCH_SIZE),  # 批量评分
+    ]
+    if translate:
+        stage_funcs.append(('translate', processor.translate_events, processor.translator.batch_size))  # 批量翻译
+    return Pipeline([
+        Stage(name, func, workers=workers.get(name, 1),
+              queue_size=queue_size, batch_size=batch_size)
+        for name, func, batch_size in stage_funcs
+    ])
 
-def run_daily_collection(processor, storage, output_file=None):
-    """执行每日数据收集"""
+def run_daily_collection(processor, storage, output_file=None, engine='threads', deadline=None,
+                         stage_workers=None, top_n=None, skip_seen=False):
+    """
+    执行每日数据收集，deadline 为总时限（秒），收集阶段最多使用其中的 COLLECTION_SHARE。
+    指定 top_n 时只翻译热度最高的前 top_n 条事件；skip_seen 时丢弃之前某天已输出过的事件。
+    """
     print("开始每日数据收集...")
     
-    # 收集原始数据
-    raw_events = collect_all_sources()
-    print(f"收集到 {len(raw_events)} 条原始事件")
+    # 收集原始数据：fetch 阶段以流的形式产出事件，与后续各阶段通过有界队列并行
+    collection_deadline = Deadline(deadline * COLLECTION_SHARE) if deadline else None
+    truncated_sources = []
+    source_stats = {}
+    if engine == 'async':
+        from .async_collectors import collect_all_sources_async
+        raw_events = collect_all_sources_async(deadline=collection_deadline,
+                                               truncated_sources=truncated_sources)
+    else:
+        collection_engine = create_engine(queue_size=PIPELINE_QUEUE_SIZE)
+        raw_events = collection_engine.stream(collection_deadline)
+    
+    # 处理
+    pipeline = build_daily_pipeline(processor, stage_workers, translate=top_n is None)
+    processed_events = []
+    pipeline_stats = pipeline.run(raw_events, processed_events.append)
+    
+    # 按热度排序后去重（与到达顺序无关，重复项中保留热度最高的一条），
+    # 再对照跨运行去重索引标记或丢弃之前已输出过的事件
+    processed_events.sort(key=DataProcessor.ranking_key)
+    duplicate_filter = DuplicateFilter()
+    dedup_index = DedupIndex(f"{storage.base_dir}/metadata/dedup_index.json",
+                             window_days=storage.retention_policy['daily'], drop_seen=skip_seen)
+    unique_events = [event for event in processed_events
+                     if duplicate_filter(event) is not None and dedup_index(event) is not None]
     
-    # 处理数据
-    processed_events = processor.process_events(raw_events)
-    print(f"处理后 {len(processed_events)} 条事件")
+    # 合并不同数据源报道的同一新闻（标题略有差异），保留热度最高的一条
+    near_dup = NearDuplicateDetector(history_file=f"{storage.base_dir}/metadata/near_dup_index.json",
+                                     window_days=storage.retention_policy['daily'])
+    unique_events = near_dup.merge(unique_events)
+    if top_n is not None:
+        processor.translate_top(unique_events, top_n)
+    if engine != 'async':
+        truncated_sources = collection_engine.truncated_sources
+        source_stats = collection_engine.source_stats
     
-    # 去重
-    unique_events = processor.remove_duplicates(processed_events)
+    processor.translation_cache.save()
+    dedup_index.save()
+    near_dup.save()
+    print(f"翻译缓存: {processor.translation_cache.stats()}")
+    
+    raw_count = pipeline_stats['source']['items']
+    processed_count = pipeline_stats['score']['processed']
+    print(f"收集到 {raw_count} 条原始事件")
+    print(f"处理后 {processed_count} 条事件")
     print(f"去重后 {len(unique_events)} 条唯一事件")
+    print(f"之前已输出过 {dedup_index.seen_before} 条事件")
+    print(f"合并 {near_dup.merged} 条近似重复事件")
     
     # 保存数据
     today = datetime.now().strftime('%Y-%m-%d')
     daily_data = {
         'date': today,
         'collection_time': datetime.now().isoformat(),
-        'total_raw_events': len(raw_events),
-        'total_processed_events': len(processed_events),
+        'total_raw_events': raw_count,
+        'total_processed_events': processed_count,
         'total_unique_events': len(unique_events),
+        'truncated_sources': truncated_sources,
+        'source_stats': source_stats,
+        'pipeline_stats': pipeline_stats,
+        'translation_cache_stats': processor.translation_cache.stats(),
+        'dedup_index_stats': dedup_index.stats(),
+        'near_duplicate_stats': near_dup.stats(),
         'events': unique_events
     }
     
     storage.save_daily_data(today, daily_data)
-    print(f"已保存每日数据到 .techhorizon/daily/{today}.json")
+    print(f"已保存每日数据到 {storage.daily_location(today)}")
     
     # 清理过期文件
     storage.cleanup_old_files()
@@ -73,27 +213,20 @@ def run_daily_collection(processor, storage, output_file=None):
         # 输出到stdout（供OpenClaw使用）
         print(json.dumps(daily_data, ensure_ascii=False))
 
-def run_weekly_analysis(processor, storage, output_file=None):
+def run_weekly_analysis(processor, storage, output_file=None, top_events=WEEKLY_TOP_EVENTS):
     """执行周度分析"""
     print("开始周度分析...")
     
-    # 获取最近7天的数据
-    weekly_events = []
-    for i in range(7):
-        date = (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d')
-        daily_data = storage.load_daily_data(date)
-        if daily_data and 'events' in daily_data:
-            weekly_events.extend(daily_data['events'])
+    # 最近7天的数据，统计由存储后端完成
+    dates = [(datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(7)]
+    total_events = storage.count_events(dates)
     
-    if not weekly_events:
+    if not total_events:
         print("没有找到足够的数据进行周度分析")
         return
     
     # 执行趋势分析（简化版）
-    categories_count = {}
-    for event in weekly_events:
-        category = event.get('primary_category', 'general')
-        categories_count[category] = categories_count.get(category, 0) + 1
+    categories_count = storage.category_counts(dates)
     
     # 生成周报
     week_number = datetime.now().strftime('%Y-W%U')
@@ -103,9 +236,9 @@ def run_weekly_analysis(processor, storage, output_file=None):
             (datetime.now() - timedelta(days=6)).strftime('%Y-%m-%d'),
             datetime.now().strftime('%Y-%m-%d')
         ],
-        'total_events': len(weekly_events),
+        'total_events': total_events,
         'category_distribution': categories_count,
-        'top_events': sorted(weekly_events, key=lambda x: x['hotness_score'], reverse=True)[:10]
+        'top_events': storage.top_events(dates, top_events)
     }
     
     storage.save_weekly_report(week_number, weekly_report)
@@ -118,19 +251,15 @@ def run_weekly_analysis(processor, storage, output_file=None):
     else:
         print(json.dumps(weekly_report, ensure_ascii=False))
 
-def run_monthly_analysis(processor, storage, output_file=None):
+def run_monthly_analysis(processor, storage, output_file=None, top_events=MONTHLY_TOP_EVENTS):
     """执行月度分析"""
     print("开始月度分析...")
     
-    # 获取最近30天的数据
-    monthly_events = []
-    for i in range(30):
-        date = (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d')
-        daily_data = storage.load_daily_data(date)
-        if daily_data and 'events' in daily_data:
-            monthly_events.extend(daily_data['events'])
+    # 最近30天的数据，统计由存储后端完成
+    dates = [(datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(30)]
+    total_events = storage.count_events(dates)
     
-    if not monthly_events:
+    if not total_events:
         print("没有找到足够的数据进行月度分析")
         return
     
@@ -138,9 +267,9 @@ def run_monthly_analysis(processor, storage, output_file=None):
     current_month = datetime.now().strftime('%Y-%m')
     monthly_report = {
         'month': current_month,
-        'total_events': len(monthly_events),
-        'top_categories': get_top_categories(monthly_events),
-        'top_events': sorted(monthly_events, key=lambda x: x['hotness_score'], reverse=True)[:20]
+        'total_events': total_events,
+        'top_categories': get_top_categories(storage.category_counts(dates)),
+        'top_events': storage.top_events(dates, top_events)
     }
     
     storage.save_monthly_report(current_month, monthly_report)
@@ -153,13 +282,47 @@ def run_monthly_analysis(processor, storage, output_file=None):
     else:
         print(json.dumps(monthly_report, ensure_ascii=False))
 
-def get_top_categories(events):
-    """获取热门分类"""
-    categories = {}
-    for event in events:
-        category = event.get('primary_category', 'general')
-        categories[category] = categories.get(category, 0) + 1
+def run_yearly_analysis(processor, storage, output_file=None):
+    """执行年度分析：由各月汇总合并，原始每日数据过期后仍可生成"""
+    print("开始年度分析...")
+    
+    current_year = datetime.now().strftime('%Y')
+    yearly_rollup = storage.build_rollup('yearly', current_year)
     
+    if not yearly_rollup or not yearly_rollup.total_events:
+        print("没有找到足够的数据进行年度分析")
+        return
+    
+    # 各月事件数
+    monthly_counts = {}
+    for month in range(1, 13):
+        monthly_rollup = storage.build_rollup('monthly', f"{current_year}-{month:02d}")
+        if monthly_rollup and monthly_rollup.total_events:
+            monthly_counts[monthly_rollup.period] = monthly_rollup.total_events
+    
+    # 生成年报
+    yearly_report = {
+        'year': current_year,
+        'total_events': yearly_rollup.total_events,
+        'distinct_events': yearly_rollup.distinct_events(),
+        'monthly_distribution': monthly_counts,
+        'top_categories': get_top_categories(yearly_rollup.categories),
+        'source_distribution': yearly_rollup.sources,
+        'top_events': yearly_rollup.top_events[:20]
+    }
+    
+    storage.save_yearly_report(current_year, yearly_report)
+    print(f"已保存年度报告到 .techhorizon/yearly/{current_year}.json")
+    
+    if output_file:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(yearly_report, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到 {output_file}")
+    else:
+        print(json.dumps(yearly_report, ensure_ascii=False))
+
+def get_top_categories(categories):
+    """获取热门分类（categories 为 分类 -> 事件数）"""
     return dict(sorted(categories.items(), key=lambda x: x[1], reverse=True)[:5])
 
 if __name__ == "__main__":
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+TechHorizon 近似重复检测模块
+字符 shingle + MinHash 签名 + LSH 分桶：同一新闻在不同数据源标题略有差异时合并为一条
+"""
+
+import os
+import re
+import json
+import random
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Iterable, Optional, Set
+
+# MinHash 使用的梅森素数
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# 英文按词归一后取字符3-gram，中文取字符2-gram
+_SEGMENT_PATTERN = re.compile(r'[\u4e00-\u9fff]+|[a-z0-9]+(?:\s+[a-z0-9]+)*')
+
+# 标题开头的标签，如 "[翻译] [AWS Blog] "、"[CVE] "
+_TAG_PREFIX_PATTERN = re.compile(r'^(?:\s*\[[^\]]*\])+\s*')
+# 标题末尾括号中重复的原文，如 "Title（Title）"
+_REPEATED_SUFFIX_PATTERN = re.compile(r'^(?P<title>.+?)\s*[（(](?P<repeat>.+)[）)]\s*$')
+# 含数字的词（版本号、型号），如 "1.23"、"gpt-4o"、"cve-2024-1234"
+_NUMERIC_TOKEN_PATTERN = re.compile(r'[a-z0-9]+(?:[.\-][a-z0-9]+)*')
+
+
+def clean_title(title: str) -> str:
+    """去掉数据源添加的标签前缀和末尾重复的原文，只留标题本身"""
+    title = _TAG_PREFIX_PATTERN.sub('', title or '')
+    match = _REPEATED_SUFFIX_PATTERN.match(title)
+    if match and match.group('repeat').strip() == match.group('title').strip():
+        title = match.group('title')
+    return title.strip()
+
+
+def numeric_tokens(text: str) -> Set[str]:
+    """含数字的词集合；两个标题的版本号/型号不同时不是同一新闻（Go 1.22 与 Go 1.23）"""
+    return {token for token in _NUMERIC_TOKEN_PATTERN.findall(text.lower())
+            if any(char.isdigit() for char in token)}
+
+
+def shingles(text: str, ascii_size: int = 3, cjk_size: int = 2) -> Set[str]:
+    """中英混合文本的字符 shingle 集合（忽略大小写和标点）"""
+    result = set()
+    for segment in _SEGMENT_PATTERN.findall(text.lower()):
+        size = cjk_size if '\u4e00' <= segment[0] <= '\u9fff' else ascii_size
+        if len(segment) <= size:
+            result.add(segment)
+            continue
+        for start in range(len(segment) - size + 1):
+            result.add(segment[start:start + size])
+    return result
+
+
+def jaccard(a: List[int], b: List[int]) -> float:
+    """由两个 MinHash 签名估计 Jaccard 相似度"""
+    if not a or len(a) != len(b):
+        return 0.0
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class MinHasher:
+    """MinHash 签名生成器，随机种子固定，签名可跨运行比较"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.permutations = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    @staticmethod
+    def _hash(shingle: str) -> int:
+        return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+
+    def signature(self, text: str) -> List[int]:
+        """文本的 MinHash 签名（无可用 shingle 时返回空列表）"""
+        hashes = [self._hash(shingle) for shingle in shingles(text)]
+        if not hashes:
+            return []
+        return [min((a * h + b) % _PRIME for h in hashes) & _MAX_HASH
+                for a, b in self.permutations]
+
+
+class LSHIndex:
+    """
+    LSH 分桶索引：签名分成 bands 段，任一段完全相同即为候选，
+    查询只比较同桶的候选，耗时与历史规模基本无关。
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets: List[Dict[tuple, List[str]]] = [{} for _ in range(bands)]
+        self.signatures: Dict[str, List[int]] = {}
+
+    def _band_keys(self, signature: List[int]):
+        for band in range(self.bands):
+            yield band, tuple(signature[band * self.rows:(band + 1) * self.rows])
+
+    def add(self, key: str, signature: List[int]):
+        if not signature or key in self.signatures:
+            return
+        self.signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self.buckets[band].setdefault(band_key, []).append(key)
+
+    def query(self, signature: List[int], threshold: float) -> List[tuple]:
+        """返回 (key, 相似度) 列表，按相似度从高到低排序"""
+        if not signature:
+            return []
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self.buckets[band].get(band_key, ()))
+        matches = [(key, jaccard(signature, self.signatures[key])) for key in candidates]
+        return sorted((match for match in matches if match[1] >= threshold),
+                      key=lambda match: match[1], reverse=True)
+
+
+class NearDuplicateDetector:
+    """
+    近似重复合并器。merge() 在一批事件内按热度从高到低聚类，每簇保留分数最高的事件，
+    并在其上记录簇内全部 sources / source_urls；只合并来自不同数据源、含数字的词完全一致的事件
+    （同一数据源的不同条目是不同新闻）。指定 history_file 时还会对照
+    保留窗口内之前各天的签名，为重复出现的新闻标记 near_duplicate_of（不丢弃）。
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16,
+                 history_file: Optional[str] = None, window_days: int = 30,
+                 today: Optional[str] = None):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.history_file = history_file
+        self.window_days = window_days
+        self.today = today or datetime.now().strftime('%Y-%m-%d')
+        self.merged = 0
+        self.history_matches = 0
+        self._lock = threading.Lock()
+        self.history = LSHIndex(num_perm, bands)
+        self.history_dates: Dict[str, str] = {}
+        self.history_tokens: Dict[str, Set[str]] = {}
+        if history_file:
+            self._load_history()
+
+    def _load_history(self):
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('num_perm') != self.num_perm:
+            return  # 签名参数变化，旧签名不可比较
+        cutoff = self._cutoff()
+        for key, entry in data.get('events', {}).items():
+            if len(entry) < 3:
+                continue  # 旧格式没有保存含数字的词，无法校验
+            day, packed, tokens = entry[:3]
+            if day >= cutoff:
+                self.history_dates[key] = day
+                self.history_tokens[key] = set(tokens)
+                self.history.add(key, self._unpack(packed))
+
+    def _cutoff(self) -> str:
+        return (datetime.strptime(self.today, '%Y-%m-%d')
+                - timedelta(days=self.window_days)).strftime('%Y-%m-%d')
+
+    @staticmethod
+    def _pack(signature: List[int]) -> str:
+        return ''.join(f"{value:08x}" for value in signature)
+
+    @staticmethod
+    def _unpack(packed: str) -> List[int]:
+        return [int(packed[i:i + 8], 16) for i in range(0, len(packed), 8)]
+
+    @staticmethod
+    def event_text(event: Dict[str, Any]) -> str:
+        return clean_title(event.get('original_title') or event.get('title') or '')
+
+    def merge(self, events: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """合并近似重复事件，返回按热度排序的代表事件列表"""
+        ordered = sorted(events, key=lambda event: event.get('hotness_score', 0), reverse=True)
+        batch = LSHIndex(self.num_perm, self.bands)
+        kept: Dict[str, Dict[str, Any]] = {}
+        kept_tokens: Dict[str, Set[str]] = {}
+        result = []
+        for event in ordered:
+            key = event.get('event_id') or event['url']
+            text = self.event_text(event)
+            signature = self.hasher.signature(text)
+            tokens = numeric_tokens(text)
+            event.setdefault('sources', [event['source']])
+            event.setdefault('source_urls', [event['url']])
+
+            matches = [other for other, _ in batch.query(signature, self.threshold)
+                       if kept_tokens[other] == tokens and event['source'] not in kept[other]['sources']]
+            if matches:
+                representative = kept[matches[0]]
+                for field in ('sources', 'source_urls'):
+                    for value in event[field]:
+                        if value not in representative[field]:
+                            representative[field].append(value)
+                representative['duplicate_count'] = representative.get('duplicate_count', 0) + 1
+                self.merged += 1
+                continue
+
+            self._match_history(event, key, signature, tokens)
+            batch.add(key, signature)
+            kept[key] = event
+            kept_tokens[key] = tokens
+            result.append(event)
+        return result
+
+    def _match_history(self, event: Dict[str, Any], key: str, signature: List[int], tokens: Set[str]):
+        if not self.history_file:
+            return
+        with self._lock:
+            matches = [(other, score) for other, score in self.history.query(signature, self.threshold)
+                       if other != key and self.history_dates[other] < self.today
+                       and self.history_tokens.get(other) == tokens]
+            if matches:
+                other = matches[0][0]
+                event['near_duplicate_of'] = {'event_id': other, 'first_seen': self.history_dates[other]}
+                self.history_matches += 1
+            if key not in self.history_dates:
+                self.history_dates[key] = self.today
+                self.history_tokens[key] = tokens
+                self.history.add(key, signature)
+
+    def save(self):
+        """保存保留窗口内的签名历史"""
+        if not self.history_file:
+            return
+        cutoff = self._cutoff()
+        with self._lock:
+            events = {key: [day, self._pack(self.history.signatures[key]),
+                            sorted(self.history_tokens.get(key, ()))]
+                      for key, day in self.history_dates.items()
+                      if day >= cutoff and key in self.history.signatures}
+            try:
+                os.makedirs(os.path.dirname(self.history_file) or '.', exist_ok=True)
+                with open(self.history_file, 'w', encoding='utf-8') as f:
+                    json.dump({'num_perm': self.num_perm, 'events': events}, f)
+            except OSError as e:
+                print(f"Failed to save near-duplicate history: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'merged': self.merged,
+            'history_matches': self.history_matches,
+            'history_events': len(self.history_dates),
+        }
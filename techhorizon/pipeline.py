@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+TechHorizon 分阶段流水线模块
+各阶段通过有界队列连接，下游处理不过来时上游自动阻塞（背压）
+"""
+
+import time
+import queue
+import threading
+from typing import List, Dict, Any, Callable, Iterable
+
+# 阶段结束标记
+_END = object()
+
+
+class Stage:
+    """
+    流水线阶段：func 处理单个条目，返回None表示丢弃该条目。
+    batch_size > 1 时为批处理阶段：func 接收条目列表并返回同样顺序的结果列表。
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Any],
+                 workers: int = 1, queue_size: int = 64,
+                 batch_size: int = 1, batch_wait: float = 0.05):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.queue_size = queue_size  # 本阶段输入队列的容量
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait  # 凑批时等待后续条目的最长时间（秒）
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.max_queue_depth = 0
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'workers': self.workers,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'busy_time': round(self.busy_time, 3),
+            'max_queue_depth': self.max_queue_depth,
+        }
+
+
+class Pipeline:
+    """由多个阶段组成的生产者/消费者流水线"""
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = stages
+
+    def _run_worker(self, stage: Stage, in_queue: queue.Queue, out_queue: queue.Queue,
+                    remaining: List[int], next_workers: int):
+        finished = False
+        while not finished:
+            item = in_queue.get()
+            if item is _END:
+                break
+
+            # 批处理阶段尽量凑满一批，上游暂时没有数据时不再等待
+            items = [item]
+            while len(items) < stage.batch_size:
+                try:
+                    item = in_queue.get(timeout=stage.batch_wait)
+                except queue.Empty:
+                    break
+                if item is _END:
+                    finished = True
+                    break
+                items.append(item)
+
+            with stage._lock:
+                stage.max_queue_depth = max(stage.max_queue_depth, in_queue.qsize() + len(items))
+            started = time.monotonic()
+            try:
+                if stage.batch_size > 1:
+                    results = stage.func(items)
+                else:
+                    results = [stage.func(items[0])]
+            except Exception as e:
+                print(f"Error in pipeline stage {stage.name}: {e}")
+                results = [None] * len(items)
+                with stage._lock:
+                    stage.errors += len(items)
+            elapsed = time.monotonic() - started
+
+            with stage._lock:
+                stage.busy_time += elapsed
+                for result in results:
+                    if result is None:
+                        stage.dropped += 1
+                    else:
+                        stage.processed += 1
+            for result in results:
+                if result is not None:
+                    out_queue.put(result)  # 下游队列已满时阻塞，形成背压
+
+        # 本阶段最后一个退出的工作线程通知下游结束
+        with stage._lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            for _ in range(next_workers):
+                out_queue.put(_END)
+
+    def run(self, source: Iterable[Any], sink: Callable[[Any], None]) -> Dict[str, Dict[str, Any]]:
+        """从 source 读取条目依次流经各阶段，最终交给 sink（在调用线程中执行），返回各阶段统计"""
+        queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        sink_queue = queue.Queue(maxsize=self.stages[-1].queue_size if self.stages else 64)
+        queues.append(sink_queue)
+
+        threads = []
+        for index, stage in enumerate(self.stages):
+            next_workers = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+            remaining = [stage.workers]
+            for worker in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._run_worker,
+                    args=(stage, queues[index], queues[index + 1], remaining, next_workers),
+                    name=f"pipeline-{stage.name}-{worker}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        first_workers = self.stages[0].workers if self.stages else 1
+        feed_stats = {'items': 0, 'error': None}
+
+        def feed():
+            try:
+                for item in source:
+                    queues[0].put(item)  # 第一阶段处理不过来时阻塞上游
+                    feed_stats['items'] += 1
+            except Exception as e:
+                print(f"Error reading pipeline source: {e}")
+                feed_stats['error'] = str(e)
+            finally:
+                for _ in range(first_workers):
+                    queues[0].put(_END)
+
+        feeder = threading.Thread(target=feed, name="pipeline-source", daemon=True)
+        feeder.start()
+
+        while True:
+            item = sink_queue.get()
+            if item is _END:
+                break
+            sink(item)
+
+        feeder.join()
+        for thread in threads:
+            thread.join()
+
+        stats = {'source': dict(feed_stats)}
+        for stage in self.stages:
+            stats[stage.name] = stage.stats()
+        return stats
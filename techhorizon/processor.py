@@ -6,13 +6,29 @@ TechHorizon 数据处理器模块
 
 import json
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional
 from datetime import datetime
+from .keywords import KeywordAutomaton
+from .scoring import NUMERIC_FIELDS, ScoringModel
+from .translation import BatchTranslator, DictionaryBackend
+from .translation_cache import TranslationCache
+from .urls import event_id, title_fingerprint
 
 class DataProcessor:
     """数据处理器"""
     
-    def __init__(self):
+    def __init__(self, translation_cache: Optional[TranslationCache] = None,
+                 translator: Optional[BatchTranslator] = None,
+                 scoring_model: Optional[ScoringModel] = None):
+        # 标题和描述共用的翻译缓存，重复出现的文本不再调用翻译
+        self.translation_cache = translation_cache or TranslationCache()
+        self.translator = translator or BatchTranslator(DictionaryBackend(), self.translation_cache)
+        if self.translator.cache is None:
+            self.translator.cache = self.translation_cache
+        
+        # 热度评分模型（权重可由配置文件覆盖）
+        self.scoring_model = scoring_model or ScoringModel()
+        
         # 技术领域关键词
         self.tech_categories = {
             'ai_ml': ['AI', '机器学习', '深度学习', '大模型', 'LLM', 'neural network', 'artificial intelligence'],
@@ -36,34 +52,45 @@ class DataProcessor:
             'funding_news': ['融资', '投资', 'funding', 'acquisition', 'investment'],
             'community_discussion': ['讨论', '社区', 'discussion', 'community', 'talk']
         }
+        
+        self.rebuild_keyword_index()
+    
+    def rebuild_keyword_index(self):
+        """把全部分类关键词编译进一个自动机；修改 tech_categories/event_types 后需重新调用"""
+        self.keyword_index = KeywordAutomaton()
+        for category, keywords in self.tech_categories.items():
+            for keyword in keywords:
+                self.keyword_index.add(keyword, ('category', category))
+        for event_type, keywords in self.event_types.items():
+            for keyword in keywords:
+                self.keyword_index.add(keyword, ('event_type', event_type))
+        self.keyword_index.build()
     
     def is_chinese(self, text: str) -> bool:
         """判断文本是否包含中文"""
         return bool(re.search(r'[\u4e00-\u9fff]', text))
     
     def translate_to_chinese(self, text: str) -> str:
-        """翻译英文为中文（模拟实现）"""
-        # TODO: 集成实际的翻译API
-        # 这里返回模拟翻译结果
+        """翻译英文为中文，优先查翻译缓存"""
         if not text.strip():
             return "无描述信息"
         
-        # 简单的模拟翻译（实际应该调用翻译服务）
-        translations = {
-            "Sample GitHub Project": "示例GitHub项目",
-            "This is a sample GitHub project description": "这是一个示例GitHub项目描述",
-            "Hacker News discussion": "Hacker News讨论",
-            "Artificial Intelligence": "人工智能",
-            "Machine Learning": "机器学习",
-            "Security vulnerability": "安全漏洞",
-            "New release": "新版本发布"
-        }
-        
-        translated = text
-        for en, zh in translations.items():
-            translated = translated.replace(en, zh)
-        
-        return translated if translated != text else f"[翻译] {text}"
+        return self.translator.translate(text)
+    
+    def needs_translation(self, text: str) -> bool:
+        """非空且不含中文的文本需要翻译"""
+        return bool(text and text.strip()) and not self.is_chinese(text)
+    
+    def prefetch_translations(self, events: Iterable[Dict[str, Any]]):
+        """收集所有待翻译的标题和描述，分少量批次翻译并写入缓存"""
+        texts = []
+        for event in events:
+            for field in ('title', 'description'):
+                text = event.get(field) or ''
+                if self.needs_translation(text):
+                    texts.append(text)
+        if texts:
+            self.translator.translate_many(texts)
     
     def process_title(self, original_title: str) -> str:
         """处理标题：中文（原英文）"""
@@ -88,22 +115,14 @@ class DataProcessor:
     
     def classify_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
         """为事件分配分类标签"""
-        title = event['title'].lower()
-        description = event['description'].lower()
-        full_text = title + ' ' + description
+        full_text = event['title'] + ' ' + event['description']
         
-        categories = []
-        event_types = []
-        
-        # 技术领域分类
-        for category, keywords in self.tech_categories.items():
-            if any(keyword.lower() in full_text for keyword in keywords):
-                categories.append(category)
-        
-        # 事件类型分类
-        for event_type, keywords in self.event_types.items():
-            if any(keyword.lower() in full_text for keyword in keywords):
-                event_types.append(event_type)
+        # 一次扫描命中所有关键词，再按配置顺序整理（第一个命中的技术领域为主分类）
+        matches = self.keyword_index.search(full_text)
+        categories = [category for category in self.tech_categories
+                      if ('category', category) in matches]
+        event_types = [event_type for event_type in self.event_types
+                       if ('event_type', event_type) in matches]
         
         # 默认分类
         if not categories:
@@ -119,78 +138,117 @@ class DataProcessor:
     
     def calculate_hotness_score(self, event: Dict[str, Any]) -> int:
         """计算热度分数"""
-        base_score = 0
-        
-        # 数据源权重
-        source_weights = {
-            'github_trending': 10,
-            'gitee_trending': 8,
-            'hacker_news': 12,
-            'readhub': 6,
-            'oschina': 5,
-            'juejin': 5
-        }
-        base_score += source_weights.get(event['source'], 1)
-        
-        # 分类权重
-        category_weights = {
-            'security': 15,
-            'ai_ml': 12,
-            'major_announcement': 10
+        return self.scoring_model.score_one(event)
+    
+    def parse_event(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """基础验证并提取所需字段，缺少标题或链接时返回None"""
+        if not event.get('title') or not event.get('url'):
+            return None
+        
+        parsed = {
+            'event_id': event.get('event_id') or event_id(event['url']),
+            'title': event['title'],
+            'description': event.get('description') or '',
+            'url': event['url'],
+            'source': event['source'],
+            'original_title': event['title'],
+            'language': 'zh' if self.is_chinese(event['title']) else 'en',
+            'translated': False
         }
-        if event.get('primary_category') in category_weights:
-            base_score += category_weights[event['primary_category']]
         
-        # 事件类型权重
-        if 'security_alert' in event.get('event_types', []):
-            base_score += 20
-        
-        return base_score
+        # 收集器提供的数值信号（点赞、评论、星标、严重程度）和发布时间
+        for field in NUMERIC_FIELDS:
+            if isinstance(event.get(field), (int, float)):
+                parsed[field] = event[field]
+        if event.get('published_at'):
+            parsed['published_at'] = event['published_at']
+        return parsed
     
-    def process_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """处理所有事件"""
-        processed_events = []
-        
-        for event in events:
-            # 基础验证
-            if not event.get('title') or not event.get('url'):
-                continue
-            
-            # 处理标题和描述
-            processed_event = {
-                'title': self.process_title(event['title']),
-                'description': self.process_description(event['description']),
-                'url': event['url'],
-                'source': event['source']
-            }
-            
-            # 分类
-            classification = self.classify_event(processed_event)
-            processed_event.update(classification)
-            
-            # 热度评分
-            processed_event['hotness_score'] = self.calculate_hotness_score(processed_event)
-            
-            processed_events.append(processed_event)
+    def translate_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """处理标题和描述（已翻译的事件不再处理）"""
+        if event.get('translated'):
+            return event
+        event['title'] = self.process_title(event['title'])
+        event['description'] = self.process_description(event['description'])
+        event['translated'] = True
+        return event
+    
+    def translate_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """批量处理标题和描述：整批待翻译文本一次交给翻译后端"""
+        self.prefetch_translations(event for event in events if not event.get('translated'))
+        return [self.translate_event(event) for event in events]
+    
+    def translate_top(self, events: List[Dict[str, Any]], top_n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """只翻译已按热度排序的前 top_n 条事件（None 表示全部），其余保留原文"""
+        selected = events if top_n is None else events[:top_n]
+        self.translate_events(selected)
+        return events
+    
+    def apply_classification(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """分类"""
+        event.update(self.classify_event(event))
+        return event
+    
+    def score_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """热度评分"""
+        event['hotness_score'] = self.calculate_hotness_score(event)
+        return event
+    
+    def score_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """批量热度评分（流水线的评分阶段，逐条直接计算，不构建特征矩阵）"""
+        for event, score in zip(events, self.scoring_model.score(events)):
+            event['hotness_score'] = score
+        return events
+    
+    def process_event(self, event: Dict[str, Any], translate: bool = True) -> Optional[Dict[str, Any]]:
+        """处理单条事件（分类和评分基于原文），缺少标题或链接时返回None"""
+        processed_event = self.parse_event(event)
+        if processed_event is None:
+            return None
+        
+        self.apply_classification(processed_event)
+        self.score_event(processed_event)
+        if translate:
+            self.translate_event(processed_event)
+        return processed_event
+    
+    def process_events(self, events: List[Dict[str, Any]], top_n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """处理所有事件：先基于原文分类评分并排序，再批量翻译前 top_n 条（None 表示全部）"""
+        processed_events = [event for event in (self.parse_event(event) for event in events) if event is not None]
+        for event in processed_events:
+            self.apply_classification(event)
+        self.score_events(processed_events)
         
         # 按热度排序
-        processed_events.sort(key=lambda x: x['hotness_score'], reverse=True)
+        processed_events.sort(key=self.ranking_key)
         
-        return processed_events
+        return self.translate_top(processed_events, top_n)
+    
+    @staticmethod
+    def ranking_key(event: Dict[str, Any]):
+        """确定性的排序键：热度从高到低，同分时按数据源和链接"""
+        return (-event['hotness_score'], event['source'], event['url'])
     
     def remove_duplicates(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """移除重复事件"""
-        seen_urls = set()
-        seen_titles = set()
-        unique_events = []
+        duplicate_filter = DuplicateFilter()
+        return [event for event in events if duplicate_filter(event) is not None]
+
+
+class DuplicateFilter:
+    """有状态的去重过滤器：按事件ID（规范化链接指纹）或标题指纹判重，先到者保留，重复项返回None"""
+    
+    def __init__(self):
+        self.seen_urls = set()
+        self.seen_titles = set()
+    
+    def __call__(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        url_key = event.get('event_id') or event_id(event['url'])
+        title_key = title_fingerprint(event.get('original_title') or event['title'])
         
-        for event in events:
-            url_hash = hash(event['url'])
-            title_hash = hash(event['title'].lower())
-            
-            if url_hash not in seen_urls and title_hash not in seen_titles:
-                unique_events.append(event)
-                seen_urls.add(url_hash)
-                seen_titles.add(title_hash)
-        
-        return unique_events
\ No newline at end of file
+        if url_key in self.seen_urls or title_key in self.seen_titles:
+            return None
+        
+        self.seen_urls.add(url_key)
+        self.seen_titles.add(title_key)
+        return event
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+TechHorizon 流式报告模块
+逐条消费事件生成器，只保留有界的Top-N堆，内存占用与事件总数无关
+"""
+
+import heapq
+import itertools
+from typing import List, Dict, Any, Iterable
+
+
+class TopN:
+    """
+    有界Top-N：按热度从高到低保留 n 条事件。
+    同分时先加入的优先，与对全部事件做稳定降序排序后取前 n 条的结果一致。
+    """
+
+    def __init__(self, n: int, key: str = 'hotness_score'):
+        self.n = n
+        self.key = key
+        self._heap = []  # 最小堆：(分数, -序号, 事件)，堆顶是当前最先被淘汰的事件
+        self._counter = itertools.count()
+
+    def add(self, event: Dict[str, Any]):
+        if self.n <= 0:
+            return
+        item = (event.get(self.key, 0), -next(self._counter), event)
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+
+    def extend(self, events: Iterable[Dict[str, Any]]):
+        for event in events:
+            self.add(event)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def result(self) -> List[Dict[str, Any]]:
+        """按热度从高到低返回"""
+        return [event for _, _, event in sorted(self._heap, key=lambda item: item[:2], reverse=True)]
+
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+TechHorizon 容错模块
+请求重试策略（指数退避+抖动，遵循Retry-After）与按数据源的熔断器
+"""
+
+import os
+import json
+import time
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+
+# 可重试的HTTP状态码
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class RetryPolicy:
+    """带上限的指数退避重试策略"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5,
+                 max_delay: float = 10.0, jitter: float = 0.5,
+                 max_retry_after: float = 60.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter  # 退避时间中随机部分的比例（0~1）
+        self.max_retry_after = max_retry_after  # 服务端要求等待更久时放弃重试
+
+    def backoff(self, attempt: int) -> float:
+        """第 attempt 次（从0开始）失败后的等待时间"""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * (1 - self.jitter) + random.uniform(0, delay * self.jitter)
+
+    def is_retryable(self, status_code: int) -> bool:
+        return status_code in RETRYABLE_STATUS
+
+    def retry_after(self, response) -> Optional[float]:
+        """解析 Retry-After 响应头（秒数或HTTP日期），无该头时返回None"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def delay_for(self, attempt: int, response=None) -> Optional[float]:
+        """计算下一次重试前的等待时间，返回None表示不应再重试"""
+        if attempt + 1 >= self.max_attempts:
+            return None
+        if response is not None:
+            retry_after = self.retry_after(response)
+            if retry_after is not None:
+                return retry_after if retry_after <= self.max_retry_after else None
+        return self.backoff(attempt)
+
+
+class CircuitBreaker:
+    """按数据源的熔断器，状态持久化在 .techhorizon/metadata 中以跨运行生效"""
+
+    def __init__(self, state_file: str = ".techhorizon/metadata/circuit_breakers.json",
+                 failure_threshold: int = 2, reset_timeout: float = 36 * 3600,
+                 max_reset_timeout: float = 7 * 86400):
+        self.state_file = state_file
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout  # 熔断后首次试探前的冷却时间（秒）
+        self.max_reset_timeout = max_reset_timeout  # 连续熔断时冷却时间翻倍的上限
+        self._lock = threading.Lock()
+        self.states = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """保存熔断器状态"""
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+                with open(self.state_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.states, f, ensure_ascii=False, indent=2)
+            except OSError as e:
+                print(f"Failed to save circuit breaker state: {e}")
+
+    def _state(self, source: str) -> Dict[str, Any]:
+        return self.states.setdefault(source, {
+            'state': 'closed', 'failures': 0, 'opened_at': None, 'cooldown': self.reset_timeout
+        })
+
+    def allow(self, source: str) -> bool:
+        """数据源是否允许执行；熔断冷却期结束后放行一次试探（半开）"""
+        with self._lock:
+            state = self._state(source)
+            if state['state'] != 'open':
+                return True
+            if time.time() - state['opened_at'] >= state['cooldown']:
+                state['state'] = 'half_open'
+                return True
+            return False
+
+    def record_success(self, source: str):
+        with self._lock:
+            self.states[source] = {
+                'state': 'closed', 'failures': 0, 'opened_at': None, 'cooldown': self.reset_timeout
+            }
+
+    def record_failure(self, source: str):
+        with self._lock:
+            state = self._state(source)
+            state['failures'] += 1
+            if state['state'] == 'half_open':
+                # 试探失败，重新熔断并延长冷却时间
+                state['cooldown'] = min(self.max_reset_timeout, state['cooldown'] * 2)
+            elif state['failures'] < self.failure_threshold:
+                return
+            state['state'] = 'open'
+            state['opened_at'] = time.time()
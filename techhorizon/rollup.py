@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+TechHorizon 汇总模块
+每日数据的紧凑汇总（各分类/数据源/事件类型计数、热度Top-K、去重计数草图），
+汇总可逐级合并：日 → 月 → 年，报告无需重新读取全部事件
+"""
+
+import math
+import base64
+import hashlib
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Iterable, Tuple
+
+from .report import TopN
+
+# 每份汇总保留的热门事件数（需不小于报告中展示的数量）
+ROLLUP_TOP_K = 20
+
+# 汇总层级；各层级都用 HyperLogLog 估计去重数，不保存事件ID集合。
+# 周报/月报统计最近7/30天的滚动窗口，直接合并每日汇总，不需要周汇总
+ROLLUP_LEVELS = ('daily', 'monthly', 'yearly')
+
+
+class HyperLogLog:
+    """HyperLogLog 去重计数草图，按寄存器取最大值合并，p=12 时误差约 1.6%"""
+
+    def __init__(self, p: int = 12):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    def add(self, value: str):
+        x = int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+        index = x >> (64 - self.p)
+        rest = x & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: 'HyperLogLog'):
+        if other.p != self.p:
+            raise ValueError("cannot merge HyperLogLog sketches of different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            estimate = self.m * math.log(self.m / zeros)  # 小基数时用线性计数修正
+        return int(round(estimate))
+
+    def to_str(self) -> str:
+        """序列化；非零寄存器较少时（每日汇总的常见情况）只保存 (下标, 值) 对"""
+        nonzero = [(index, rank) for index, rank in enumerate(self.registers) if rank]
+        if len(nonzero) * 3 < self.m:
+            packed = b''.join(index.to_bytes(2, 'big') + bytes([rank]) for index, rank in nonzero)
+            return 's:' + base64.b64encode(packed).decode('ascii')
+        return base64.b64encode(bytes(self.registers)).decode('ascii')
+
+    @classmethod
+    def from_str(cls, data: str, p: int = 12) -> 'HyperLogLog':
+        sketch = cls(p)
+        if data.startswith('s:'):
+            packed = base64.b64decode(data[2:])
+            for offset in range(0, len(packed) - 2, 3):
+                index = int.from_bytes(packed[offset:offset + 2], 'big')
+                if index < sketch.m:
+                    sketch.registers[index] = packed[offset + 2]
+            return sketch
+        registers = base64.b64decode(data)
+        if len(registers) == sketch.m:
+            sketch.registers = bytearray(registers)
+        return sketch
+
+
+def _add_counts(target: Dict[str, int], source: Dict[str, int]):
+    for key, count in source.items():
+        target[key] = target.get(key, 0) + count
+
+
+class Rollup:
+    """可合并的汇总：计数相加、Top-K 合并后截断、去重草图合并"""
+
+    def __init__(self, period: str, top_k: int = ROLLUP_TOP_K, level: str = 'daily'):
+        self.period = period
+        self.level = level
+        self.top_k = top_k
+        self.total_events = 0
+        self.categories: Dict[str, int] = {}
+        self.sources: Dict[str, int] = {}
+        self.event_types: Dict[str, int] = {}
+        self.top_events: List[Dict[str, Any]] = []
+        self.distinct = HyperLogLog()
+
+    @classmethod
+    def from_events(cls, period: str, events: Iterable[Dict[str, Any]],
+                    top_k: int = ROLLUP_TOP_K) -> 'Rollup':
+        rollup = cls(period, top_k)
+        top = TopN(top_k)
+        for event in events:
+            rollup.add(event)
+            top.add(event)
+        rollup.top_events = top.result()
+        return rollup
+
+    def add(self, event: Dict[str, Any]):
+        """计入一条事件的计数和去重信息（热门事件由 from_events 用有界堆维护）"""
+        self.total_events += 1
+        category = event.get('primary_category', 'general')
+        self.categories[category] = self.categories.get(category, 0) + 1
+        source = event.get('source', 'unknown')
+        self.sources[source] = self.sources.get(source, 0) + 1
+        for event_type in event.get('event_types', []):
+            self.event_types[event_type] = self.event_types.get(event_type, 0) + 1
+        if event.get('event_id'):
+            self.distinct.add(event['event_id'])
+
+    def _trim_top(self):
+        # 稳定排序：同分时保持加入顺序
+        self.top_events = sorted(self.top_events, key=lambda x: x.get('hotness_score', 0),
+                                 reverse=True)[:self.top_k]
+
+    def merge(self, other: 'Rollup') -> 'Rollup':
+        """合入另一份汇总（同分的热门事件中本汇总已有的排在前面）"""
+        self.total_events += other.total_events
+        _add_counts(self.categories, other.categories)
+        _add_counts(self.sources, other.sources)
+        _add_counts(self.event_types, other.event_types)
+        self.distinct.merge(other.distinct)
+        self.top_events.extend(other.top_events)
+        self._trim_top()
+        return self
+
+    @classmethod
+    def merge_all(cls, period: str, rollups: Iterable['Rollup'], top_k: int = ROLLUP_TOP_K,
+                  level: str = 'daily') -> 'Rollup':
+        merged = cls(period, top_k, level)
+        for rollup in rollups:
+            merged.merge(rollup)
+        return merged
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'period': self.period,
+            'level': self.level,
+            'top_k': self.top_k,
+            'total_events': self.total_events,
+            'categories': self.categories,
+            'sources': self.sources,
+            'event_types': self.event_types,
+            'top_events': self.top_events,
+            'distinct_sketch': self.distinct.to_str(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Rollup':
+        rollup = cls(data['period'], data.get('top_k', ROLLUP_TOP_K), data.get('level', 'daily'))
+        rollup.total_events = data.get('total_events', 0)
+        rollup.categories = dict(data.get('categories', {}))
+        rollup.sources = dict(data.get('sources', {}))
+        rollup.event_types = dict(data.get('event_types', {}))
+        rollup.top_events = list(data.get('top_events', []))
+        if data.get('distinct_sketch'):
+            rollup.distinct = HyperLogLog.from_str(data['distinct_sketch'])
+        for event_id in data.get('event_ids', []):  # 旧版每日汇总保存的事件ID列表
+            rollup.distinct.add(event_id)
+        return rollup
+
+    def distinct_events(self) -> int:
+        """去重后的事件数估计值（同一事件出现在多天时只计一次）"""
+        return self.distinct.count()
+
+
+def period_for(level: str, day: date) -> str:
+    """某天所属的汇总周期：daily=YYYY-MM-DD，monthly=YYYY-MM，yearly=YYYY"""
+    if level == 'daily':
+        return day.strftime('%Y-%m-%d')
+    if level == 'monthly':
+        return day.strftime('%Y-%m')
+    if level == 'yearly':
+        return day.strftime('%Y')
+    raise ValueError(f"unknown rollup level: {level}")
+
+
+def period_days(level: str, period: str) -> List[date]:
+    """周期内的全部日期"""
+    if level == 'daily':
+        return [datetime.strptime(period, '%Y-%m-%d').date()]
+    if level == 'monthly':
+        first = datetime.strptime(period, '%Y-%m').date()
+        days = []
+        day = first
+        while day.month == first.month:
+            days.append(day)
+            day += timedelta(days=1)
+        return days
+    if level == 'yearly':
+        first = date(int(period), 1, 1)
+        return [first + timedelta(days=i) for i in range((date(int(period) + 1, 1, 1) - first).days)]
+    raise ValueError(f"unknown rollup level: {level}")
+
+
+def child_periods(level: str, period: str) -> Tuple[str, List[str]]:
+    """
+    上一级汇总由哪些下一级汇总合并而来：月由每日汇总合并，年由月汇总合并。
+    """
+    if level == 'monthly':
+        return 'daily', [period_for('daily', day) for day in period_days(level, period)]
+    if level == 'yearly':
+        return 'monthly', [f"{period}-{month:02d}" for month in range(1, 13)]
+    raise ValueError(f"rollup level {level} has no children")
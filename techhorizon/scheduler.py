@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+TechHorizon 并发调度模块
+负责多数据源并行收集与按主机限速
+"""
+
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Any, Iterator, Optional
+from urllib.parse import urlparse
+
+# 各主机两次请求之间的最小间隔（秒），未列出的主机使用默认值
+DEFAULT_HOST_INTERVALS = {
+    'github.com': 1.0,
+    'api.github.com': 1.0,
+    'api.readhub.cn': 0.5,
+    'www.oschina.net': 0.5,
+    'api.juejin.cn': 0.5,
+    'hacker-news.firebaseio.com': 0.05,
+}
+
+
+class HostRateLimiter:
+    """按主机限速器，保证同一主机的请求之间保持最小间隔"""
+
+    def __init__(self, default_interval: float = 0.2,
+                 host_intervals: Optional[Dict[str, float]] = None):
+        self.default_interval = default_interval
+        self.host_intervals = dict(DEFAULT_HOST_INTERVALS)
+        if host_intervals:
+            self.host_intervals.update(host_intervals)
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def interval_for(self, host: str) -> float:
+        """获取主机的请求间隔"""
+        return self.host_intervals.get(host, self.default_interval)
+
+    def reserve(self, url: str) -> float:
+        """为该URL所在主机预约下一个请求时隙，返回需要等待的秒数"""
+        host = urlparse(url).netloc.lower()
+        if not host:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval_for(host)
+
+        return max(0.0, slot - now)
+
+    def wait(self, url: str):
+        """等待直到允许向该URL所在主机发起请求"""
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+
+# 进程内共享的限速器，所有收集器共用
+rate_limiter = HostRateLimiter()
+
+
+class BudgetExceeded(Exception):
+    """时间预算已用完"""
+
+
+class Deadline:
+    """截止时间，可嵌套：子截止时间不会晚于父截止时间"""
+
+    def __init__(self, seconds: float, parent: Optional['Deadline'] = None):
+        self.expires_at = time.monotonic() + max(0.0, seconds)
+        if parent is not None:
+            self.expires_at = min(self.expires_at, parent.expires_at)
+
+    def remaining(self) -> float:
+        """剩余秒数（不小于0）"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def clamp(self, timeout: float) -> float:
+        """把请求超时限制在剩余时间之内，时间已用完时抛出 BudgetExceeded"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise BudgetExceeded("time budget exhausted")
+        return min(timeout, remaining)
+
+
+# 数据源结束标记
+_SOURCE_DONE = object()
+
+
+class CollectionEngine:
+    """并行收集引擎：在有界线程池中运行各收集器的 iter_collect()/collect()"""
+
+    def __init__(self, collectors: Dict[str, Any],
+                 source_limits: Optional[Dict[str, int]] = None,
+                 max_workers: int = 8, breaker=None,
+                 source_budgets: Optional[Dict[str, float]] = None,
+                 default_budget: float = 120.0, queue_size: int = 0):
+        self.collectors = collectors
+        self.source_limits = source_limits or {}
+        self.max_workers = max(1, max_workers)
+        self.breaker = breaker  # 可选的 CircuitBreaker，跳过持续失败的数据源
+        self.source_budgets = source_budgets or {}  # 各数据源的时间预算（秒）
+        self.default_budget = default_budget
+        self.queue_size = queue_size  # stream() 输出队列容量，0为不限；有界时消费方处理慢会让收集线程等待
+        self.source_stats = {}
+
+    @property
+    def truncated_sources(self) -> List[str]:
+        """因时间预算用完而只返回部分结果的数据源"""
+        return [name for name, stats in self.source_stats.items() if stats.get('truncated')]
+
+    def _collect_one(self, source_name: str, collector, emit,
+                     deadline: Optional[Deadline] = None) -> int:
+        """运行单个收集器，每解析出一条事件就交给 emit，返回事件数；异常不会向外抛出"""
+        if self.breaker and not self.breaker.allow(source_name):
+            print(f"Skipping {source_name}: circuit open after repeated failures")
+            self.source_stats[source_name] = {'events': 0, 'elapsed': 0.0, 'status': 'circuit_open'}
+            return 0
+
+        limit = self.source_limits.get(source_name, 10)
+        started = time.monotonic()
+        collector.fetch_errors = 0
+        collector.truncated = False
+        collector.budget = Deadline(self.source_budgets.get(source_name, self.default_budget), deadline)
+        count = 0
+        failed = False
+        try:
+            # 支持流式产出的收集器边解析边交付，其余退回到 collect()
+            iter_collect = getattr(collector, 'iter_collect', None)
+            events = iter_collect(limit) if iter_collect else collector.collect(limit)
+            for event in events:
+                emit(event)
+                count += 1
+        except Exception as e:
+            print(f"Error collecting from {source_name}: {e}")
+            failed = True
+        # 预算保留在收集器上，使仍在后台运行的子请求在截止后立即放弃
+        truncated = collector.truncated or collector.budget.expired()
+
+        # 没有拿到任何数据且存在失败请求时视为本次失败
+        failed = failed or (not count and getattr(collector, 'fetch_errors', 0) > 0)
+        if failed and truncated:
+            # 因预算耗尽而中断不代表数据源故障，不计入熔断
+            status = 'truncated'
+        elif failed:
+            status = 'failed'
+        else:
+            status = 'ok'
+        if self.breaker:
+            if status == 'failed':
+                self.breaker.record_failure(source_name)
+            elif status == 'ok':
+                self.breaker.record_success(source_name)
+
+        self.source_stats[source_name] = {
+            'events': count,
+            'elapsed': round(time.monotonic() - started, 3),
+            'status': status,
+            'truncated': truncated,
+        }
+        return count
+
+    def stream(self, deadline: Optional[Deadline] = None) -> Iterator[Dict[str, Any]]:
+        """并行收集所有数据源，事件一经解析立即产出，后续处理可与仍在下载的数据源重叠"""
+        events = queue.Queue(maxsize=self.queue_size)
+        closed = threading.Event()
+
+        def emit(item):
+            # 队列满时等待消费方；消费方已停止时丢弃，避免收集线程永久阻塞
+            while not closed.is_set():
+                try:
+                    events.put(item, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = {}
+        for source_name, collector in self.collectors.items():
+            print(f"Collecting from {source_name}...")
+            future = executor.submit(self._collect_one, source_name, collector, emit, deadline)
+            # 每个数据源结束时放入一个结束标记
+            future.add_done_callback(lambda f, name=source_name: emit((_SOURCE_DONE, name)))
+            futures[source_name] = future
+
+        # 收集器会在预算内自行返回部分结果，这里的超时只是兜底
+        give_up_at = deadline.expires_at + 5 if deadline else None
+        finished = set()
+        try:
+            while len(finished) < len(futures):
+                timeout = max(0.0, give_up_at - time.monotonic()) if give_up_at else None
+                try:
+                    item = events.get(timeout=timeout)
+                except queue.Empty:
+                    for source_name, future in futures.items():
+                        if source_name not in finished:
+                            future.cancel()
+                            print(f"Gave up waiting for {source_name}: run deadline reached")
+                            self.source_stats[source_name] = {
+                                'events': 0, 'elapsed': None, 'status': 'timed_out', 'truncated': True
+                            }
+                    break
+                if isinstance(item, tuple) and item and item[0] is _SOURCE_DONE:
+                    finished.add(item[1])
+                    print(f"Collected {self.source_stats.get(item[1], {}).get('events', 0)} events from {item[1]}")
+                    continue
+                yield item
+        finally:
+            closed.set()
+            executor.shutdown(wait=False)
+            if self.breaker:
+                self.breaker.save()
+
+    def run(self, deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+        """并行收集所有数据源，结果按数据源注册顺序合并；deadline 为整体截止时间"""
+        order = {source_name: index for index, source_name in enumerate(self.collectors)}
+        all_events = list(self.stream(deadline))
+        all_events.sort(key=lambda event: order.get(event.get('source'), len(order)))
+        return all_events
+
+
+def iter_ordered(fetch, keys: List[Any], accept, limit: int,
+                 max_in_flight: int = 8, should_stop=None) -> Iterator[Any]:
+    """
+    按 keys 原有顺序并发获取条目，同时在途请求数不超过 max_in_flight，结果按顺序逐个产出。
+    产出 limit 个通过 accept 的结果后立即停止，不再提交新请求；
+    should_stop 返回True时（如时间预算用完）同样提前停止。
+    线程池大小等于在途窗口，停止时已提交的请求（最多 max_in_flight - 1 个）都已在执行、无法取消，
+    它们在后台跑完后结果被丢弃；需要尽快放弃的调用方应在 fetch 内部自行检查预算。
+    """
+    if limit <= 0 or not keys:
+        return
+
+    max_in_flight = max(1, max_in_flight)
+    emitted = 0
+    done = {}
+    pending = {}
+    next_submit = 0
+    next_emit = 0
+
+    executor = ThreadPoolExecutor(max_workers=max_in_flight)
+    try:
+        while next_emit < len(keys) and emitted < limit:
+            if should_stop and should_stop():
+                break
+
+            # 补齐在途窗口
+            while next_submit < len(keys) and len(pending) < max_in_flight:
+                future = executor.submit(fetch, keys[next_submit])
+                pending[future] = next_submit
+                next_submit += 1
+
+            # 等待任一请求完成，结果暂存后按顺序产出
+            finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in finished:
+                index = pending.pop(future)
+                try:
+                    done[index] = future.result()
+                except Exception as e:
+                    print(f"Error fetching {keys[index]}: {e}")
+                    done[index] = None
+
+            while next_emit in done and emitted < limit:
+                item = done.pop(next_emit)
+                next_emit += 1
+                if item is not None and accept(item):
+                    emitted += 1
+                    yield item
+    finally:
+        # 不等待剩余在途请求
+        executor.shutdown(wait=False)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+TechHorizon 热度评分模块
+热度分数为数据源、主分类、事件类型和数值信号的加权和。流水线中逐条直接计算；
+对比不同权重时可把一批事件编码为特征矩阵，安装 numpy 时按矩阵批量重新评分，两者结果一致。
+"""
+
+import os
+import json
+import copy
+from typing import List, Dict, Any, Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖
+    np = None
+
+# 收集器提供的数值信号字段，缺失时按0计
+NUMERIC_FIELDS = ('points', 'comments', 'stars', 'stars_today', 'severity')
+
+# 默认权重（与原 calculate_hotness_score 一致）
+DEFAULT_WEIGHTS = {
+    # 数据源权重，未列出的数据源使用 default_source
+    'source': {
+        'github_trending': 10,
+        'gitee_trending': 8,
+        'hacker_news': 12,
+        'readhub': 6,
+        'oschina': 5,
+        'juejin': 5,
+    },
+    'default_source': 1,
+    # 主分类权重
+    'category': {
+        'security': 15,
+        'ai_ml': 12,
+        'major_announcement': 10,
+    },
+    # 事件类型权重（事件包含该类型即加分）
+    'event_type': {
+        'security_alert': 20,
+    },
+    # 数值信号权重（分数 += 权重 × 字段值），默认不参与评分
+    'numeric': {field: 0 for field in NUMERIC_FIELDS},
+}
+
+DEFAULT_WEIGHTS_FILE = ".techhorizon/config/scoring_weights.json"
+
+
+def load_weights(path: Optional[str] = None) -> Dict[str, Any]:
+    """读取权重配置（JSON），按节覆盖默认权重；文件不存在时使用默认权重"""
+    weights = copy.deepcopy(DEFAULT_WEIGHTS)
+    path = path or DEFAULT_WEIGHTS_FILE
+    if not os.path.exists(path):
+        return weights
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Failed to load scoring weights from {path}: {e}")
+        return weights
+    for section, value in overrides.items():
+        if isinstance(value, dict) and isinstance(weights.get(section), dict):
+            weights[section].update(value)
+        else:
+            weights[section] = value
+    return weights
+
+
+class FeatureMatrix:
+    """
+    一批事件的特征矩阵，可用不同权重反复评分（A/B对比权重时只需构建一次）。
+    列按名称标识（如 source:hacker_news、category:ai_ml），与具体权重无关，
+    权重中新增的数据源或分类同样可以对已构建的矩阵评分。
+    """
+
+    def __init__(self, columns: List[str], rows: List[List[tuple]]):
+        self.columns = columns
+        self.rows = rows  # 每个事件的非零特征 (列下标, 取值)（稀疏表示）
+        self._dense = None
+
+    @classmethod
+    def from_events(cls, events: Iterable[Dict[str, Any]],
+                    numeric_fields: Iterable[str] = NUMERIC_FIELDS) -> 'FeatureMatrix':
+        columns: List[str] = []
+        index: Dict[str, int] = {}
+
+        def column(name: str) -> int:
+            position = index.get(name)
+            if position is None:
+                position = index[name] = len(columns)
+                columns.append(name)
+            return position
+
+        numeric_fields = list(numeric_fields)
+        rows = []
+        for event in events:
+            active = [(column(f"source:{event.get('source')}"), 1)]
+            if event.get('primary_category'):
+                active.append((column(f"category:{event['primary_category']}"), 1))
+            for event_type in dict.fromkeys(event.get('event_types', [])):
+                active.append((column(f"event_type:{event_type}"), 1))
+            for name in numeric_fields:
+                value = event.get(name)
+                if value:
+                    active.append((column(f"numeric:{name}"), value))
+            rows.append(active)
+        return cls(columns, rows)
+
+    @property
+    def dense(self):
+        """numpy 稠密矩阵（首次使用时构建，未安装 numpy 时为None）"""
+        if self._dense is None and np is not None:
+            dense = np.zeros((len(self.rows), len(self.columns)), dtype=np.float64)
+            row_index = [i for i, active in enumerate(self.rows) for _ in active]
+            col_index = [column for active in self.rows for column, _ in active]
+            values = [value for active in self.rows for _, value in active]
+            dense[row_index, col_index] = values
+            self._dense = dense
+        return self._dense
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+def _as_number(score: Any) -> Any:
+    return int(score) if float(score).is_integer() else score
+
+
+class ScoringModel:
+    """线性热度评分模型：分数 = 特征 · 权重"""
+
+    def __init__(self, weights: Optional[Dict[str, Any]] = None):
+        self.weights = weights or copy.deepcopy(DEFAULT_WEIGHTS)
+        self._source = dict(self.weights.get('source', {}))
+        self._default_source = self.weights.get('default_source', 0)
+        self._category = dict(self.weights.get('category', {}))
+        self._event_type = list(self.weights.get('event_type', {}).items())
+        self._numeric = [(name, weight) for name, weight in self.weights.get('numeric', {}).items() if weight]
+
+    @classmethod
+    def from_config(cls, path: Optional[str] = None) -> 'ScoringModel':
+        return cls(load_weights(path))
+
+    def column_weight(self, column: str) -> Any:
+        """按列名取权重，权重中没有的列按0计（数据源按 default_source）"""
+        kind, _, name = column.partition(':')
+        if kind == 'source':
+            return self._source.get(name, self._default_source)
+        return self.weights.get(kind, {}).get(name, 0)
+
+    def feature_matrix(self, events: Iterable[Dict[str, Any]]) -> FeatureMatrix:
+        """把一批事件编码为特征矩阵，供不同权重反复评分"""
+        numeric_fields = dict.fromkeys(list(NUMERIC_FIELDS) + list(self.weights.get('numeric', {})))
+        return FeatureMatrix.from_events(events, numeric_fields)
+
+    def score_matrix(self, matrix: FeatureMatrix) -> List[Any]:
+        """对特征矩阵评分，列按名称映射到本模型的权重"""
+        vector = [self.column_weight(column) for column in matrix.columns]
+        dense = matrix.dense
+        if dense is not None and len(matrix):
+            scores = (dense @ np.asarray(vector, dtype=np.float64)).tolist()
+        else:
+            scores = [sum(vector[column] * value for column, value in active) for active in matrix.rows]
+        return [_as_number(score) for score in scores]
+
+    def score(self, events: List[Dict[str, Any]]) -> List[Any]:
+        """批量计算热度分数，按输入顺序返回（直接逐条计算，不构建矩阵）"""
+        return [self.score_one(event) for event in events]
+
+    def score_one(self, event: Dict[str, Any]) -> Any:
+        score = self._source.get(event.get('source'), self._default_source)
+        score += self._category.get(event.get('primary_category'), 0)
+        event_types = event.get('event_types', [])
+        score += sum(weight for name, weight in self._event_type if name in event_types)
+        score += sum(weight * event[name] for name, weight in self._numeric if event.get(name))
+        return _as_number(score)
@@ -5,9 +5,15 @@ TechHorizon 文件存储和管理模块
 
 import os
 import json
+import uuid
 import shutil
+import sqlite3
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterable, Iterator, Optional
+from .http_cache import HTTPCache
+from .report import TopN
+from .rollup import ROLLUP_LEVELS, ROLLUP_TOP_K, Rollup, child_periods, period_days, period_for
 
 class DataStorage:
     """数据存储管理器"""
@@ -21,7 +27,9 @@ class DataStorage:
             'daily': 30,      # 天
             'weekly': 52,     # 周  
             'monthly': 24,    # 月
-            'cache': 7        # 天
+            'cache': 7,       # 天
+            'rollup': 400,    # 天，每日汇总比原始数据保留更久
+            'cache_max_mb': 50  # HTTP缓存总大小上限
         }
     
     def setup_directories(self):
@@ -30,19 +38,102 @@ class DataStorage:
             f"{self.base_dir}/daily",
             f"{self.base_dir}/weekly", 
             f"{self.base_dir}/monthly",
+            f"{self.base_dir}/yearly",
             f"{self.base_dir}/cache",
             f"{self.base_dir}/metadata"
-        ]
+        ] + [f"{self.base_dir}/metadata/rollups/{level}" for level in ROLLUP_LEVELS]
         
         for directory in directories:
             os.makedirs(directory, exist_ok=True)
     
     def save_daily_data(self, date: str, data: Dict[str, Any]):
-        """保存每日数据"""
+        """保存每日数据，写入当天的汇总，并更新当天所属的月/年汇总"""
+        self._write_daily_data(date, data)
+        self.save_rollup(Rollup.from_events(date, self._rollup_events(date, data)))
+        self.update_rollups(date)
+    
+    def _write_daily_data(self, date: str, data: Dict[str, Any]):
         file_path = f"{self.base_dir}/daily/{date}.json"
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
     
+    def _rollup_events(self, date: str, data: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """用于生成当天汇总的事件"""
+        return data.get('events', [])
+    
+    def _rollup_path(self, period: str, level: str = 'daily') -> str:
+        return f"{self.base_dir}/metadata/rollups/{level}/{period}.json"
+    
+    def save_rollup(self, rollup: Rollup):
+        """保存汇总"""
+        with open(self._rollup_path(rollup.period, rollup.level), 'w', encoding='utf-8') as f:
+            json.dump(rollup.to_dict(), f, ensure_ascii=False)
+    
+    def _read_rollup(self, period: str, level: str = 'daily') -> Optional[Rollup]:
+        try:
+            with open(self._rollup_path(period, level), 'r', encoding='utf-8') as f:
+                return Rollup.from_dict(json.load(f))
+        except (OSError, ValueError):
+            return None
+    
+    def load_rollup(self, date: str) -> Optional[Rollup]:
+        """
+        加载每日汇总；没有汇总但有每日数据时在内存中补建（只读，不写回磁盘，
+        每日汇总只由 save_daily_data 写入），都没有时返回None
+        """
+        rollup = self._read_rollup(date)
+        if rollup is not None:
+            return rollup
+        daily_data = self.load_daily_data(date)
+        if not daily_data:
+            return None
+        return Rollup.from_events(date, self._rollup_events(date, daily_data))
+    
+    def build_rollup(self, level: str, period: str, refresh: bool = False) -> Optional[Rollup]:
+        """
+        获取月/年汇总：已结束且已保存的周期直接读取，否则由下一级汇总合并后保存。
+        注意报告生成时也会经由此处写入月/年汇总文件：上一级汇总一旦保存，
+        即使下一级数据过期也仍可使用，这是年报在原始数据过期后仍能生成的前提。
+        """
+        if level == 'daily':
+            return self.load_rollup(period)
+        
+        today = datetime.now().date()
+        closed = max(period_days(level, period)) < today
+        if closed and not refresh:
+            rollup = self._read_rollup(period, level)
+            if rollup is not None:
+                return rollup
+        
+        child_level, children = child_periods(level, period)
+        child_rollups = [self.build_rollup(child_level, child) for child in children
+                         if min(period_days(child_level, child)) <= today]
+        child_rollups = [rollup for rollup in child_rollups if rollup is not None]
+        if not child_rollups:
+            return self._read_rollup(period, level)
+        
+        rollup = Rollup.merge_all(period, child_rollups, level=level)
+        self.save_rollup(rollup)
+        return rollup
+    
+    def update_rollups(self, date: str):
+        """重建某天所属的月、年汇总"""
+        day = datetime.strptime(date, '%Y-%m-%d').date()
+        for level in ROLLUP_LEVELS[1:]:
+            self.build_rollup(level, period_for(level, day), refresh=True)
+    
+    def save_yearly_report(self, year: str, report: Dict[str, Any]):
+        """保存年度报告"""
+        file_path = f"{self.base_dir}/yearly/{year}.json"
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    
+    def merged_rollup(self, dates: Iterable[str]) -> Rollup:
+        """合并多天的汇总（dates 靠前的日期在同分热门事件中优先）"""
+        dates = list(dates)
+        period = f"{min(dates)}..{max(dates)}" if dates else ''
+        return Rollup.merge_all(period, filter(None, (self.load_rollup(date) for date in dates)))
+    
     def save_weekly_report(self, week: str, report: Dict[str, Any]):
         """保存周度报告"""
         file_path = f"{self.base_dir}/weekly/{week}.json"
@@ -63,6 +154,33 @@ class DataStorage:
                 return json.load(f)
         return {}
     
+    def daily_location(self, date: str) -> str:
+        """每日数据的保存位置（用于日志输出）"""
+        return f"{self.base_dir}/daily/{date}.json"
+    
+    def _iter_events(self, dates: Iterable[str]):
+        for date in dates:
+            daily_data = self.load_daily_data(date)
+            if daily_data and 'events' in daily_data:
+                yield from daily_data['events']
+    
+    def count_events(self, dates: Iterable[str]) -> int:
+        """指定日期范围内的事件总数（合并每日汇总）"""
+        return self.merged_rollup(dates).total_events
+    
+    def category_counts(self, dates: Iterable[str]) -> Dict[str, int]:
+        """指定日期范围内各主分类的事件数（合并每日汇总）"""
+        return self.merged_rollup(dates).categories
+    
+    def top_events(self, dates: Iterable[str], limit: int) -> List[Dict[str, Any]]:
+        """指定日期范围内热度最高的事件（同分时按日期顺序、当日顺序）"""
+        if limit <= ROLLUP_TOP_K:
+            return self.merged_rollup(dates).top_events[:limit]
+        # 超过汇总保留的数量时逐天、逐条读取事件，只保留有界Top-N堆，内存与事件总数无关
+        top = TopN(limit)
+        top.extend(self._iter_events(dates))
+        return top.result()
+    
     def get_all_daily_files(self) -> List[str]:
         """获取所有每日数据文件"""
         daily_dir = f"{self.base_dir}/daily"
@@ -85,6 +203,17 @@ class DataStorage:
         
         # 清理缓存
         self._cleanup_by_retention('cache', self.retention_policy['cache'])
+        
+        # 清理汇总：月汇总与月报保留同样久，年汇总每年只有一份，永久保留
+        self._cleanup_by_retention('metadata/rollups/daily', self.retention_policy['rollup'])
+        self._cleanup_by_retention('metadata/rollups/monthly', self.retention_policy['monthly'] * 30)
+        
+        # HTTP条件请求缓存按TTL和总大小淘汰
+        http_cache = HTTPCache(f"{self.base_dir}/cache/http")
+        removed = http_cache.evict(ttl_days=self.retention_policy['cache'],
+                                   max_bytes=self.retention_policy['cache_max_mb'] * 1024 * 1024)
+        if removed:
+            print(f"Evicted {removed} HTTP cache entries")
     
     def _cleanup_by_retention(self, data_type: str, days: int):
         """按保留策略清理文件"""
@@ -95,7 +224,7 @@ class DataStorage:
         cutoff_time = datetime.now() - timedelta(days=days)
         
         for filename in os.listdir(directory):
-            if filename.endswith('.json'):
+            if filename.endswith(('.json', '.jsonl')):
                 file_path = os.path.join(directory, filename)
                 file_mtime = datetime.fromtimestamp(os.path.getmtime(file_path))
                 
@@ -113,4 +242,269 @@ class DataStorage:
             for filename in filenames:
                 filepath = os.path.join(dirpath, filename)
                 total_size += os.path.getsize(filepath)
-        return total_size
\ No newline at end of file
+        return total_size
+
+class SQLiteStorage(DataStorage):
+    """
+    SQLite存储后端：每日数据拆分为 days / events 两张表，事件按日期、数据源、主分类、
+    事件ID和热度建索引，周报/月报的统计直接用聚合查询完成。周报、月报仍保存为JSON文件。
+    """
+    
+    def __init__(self, base_dir: str = ".techhorizon", db_path: str = None):
+        super().__init__(base_dir)
+        self.db_path = db_path or f"{base_dir}/techhorizon.db"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS days (
+                date TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS events (
+                date TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                event_id TEXT,
+                source TEXT,
+                primary_category TEXT,
+                hotness_score REAL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (date, position)
+            );
+            CREATE INDEX IF NOT EXISTS idx_events_source ON events(source);
+            CREATE INDEX IF NOT EXISTS idx_events_category ON events(date, primary_category);
+            CREATE INDEX IF NOT EXISTS idx_events_event_id ON events(event_id);
+            CREATE INDEX IF NOT EXISTS idx_events_hotness ON events(hotness_score DESC, date);
+        """)
+    
+    def daily_location(self, date: str) -> str:
+        return f"{self.db_path}#{date}"
+    
+    def _write_daily_data(self, date: str, data: Dict[str, Any]):
+        """保存每日数据（同一天再次保存时整体替换）"""
+        summary = {key: value for key, value in data.items() if key != 'events'}
+        rows = [
+            (date, position, event.get('event_id'), event.get('source'),
+             event.get('primary_category', 'general'), event.get('hotness_score', 0),
+             json.dumps(event, ensure_ascii=False))
+            for position, event in enumerate(data.get('events', []))
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM events WHERE date = ?", (date,))
+            self._conn.execute("INSERT OR REPLACE INTO days (date, data) VALUES (?, ?)",
+                               (date, json.dumps(summary, ensure_ascii=False)))
+            self._conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    
+    def load_daily_data(self, date: str) -> Dict[str, Any]:
+        """加载每日数据"""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM days WHERE date = ?", (date,)).fetchone()
+            if row is None:
+                return {}
+            events = self._conn.execute(
+                "SELECT data FROM events WHERE date = ? ORDER BY position", (date,)
+            ).fetchall()
+        daily_data = json.loads(row[0])
+        daily_data['events'] = [json.loads(event) for event, in events]
+        return daily_data
+    
+    def get_all_daily_files(self) -> List[str]:
+        """已保存的日期（与文件后端一致，返回 {date}.json 形式）"""
+        with self._lock:
+            rows = self._conn.execute("SELECT date FROM days ORDER BY date").fetchall()
+        return [f"{date}.json" for date, in rows]
+    
+    @staticmethod
+    def _placeholders(dates: List[str]) -> str:
+        return ','.join('?' * len(dates))
+    
+    def count_events(self, dates: Iterable[str]) -> int:
+        dates = list(dates)
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM events WHERE date IN ({self._placeholders(dates)})", dates
+            ).fetchone()[0]
+    
+    def category_counts(self, dates: Iterable[str]) -> Dict[str, int]:
+        dates = list(dates)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT primary_category, COUNT(*) FROM events WHERE date IN ({self._placeholders(dates)}) "
+                "GROUP BY primary_category", dates
+            ).fetchall()
+        return dict(rows)
+    
+    def top_events(self, dates: Iterable[str], limit: int) -> List[Dict[str, Any]]:
+        dates = list(dates)
+        if not dates:
+            return []
+        # 同分时的顺序与文件后端一致：dates 中靠前的日期优先，其次按当日顺序
+        order = ' '.join(f"WHEN ? THEN {rank}" for rank in range(len(dates)))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM events WHERE date IN ({self._placeholders(dates)}) "
+                f"ORDER BY hotness_score DESC, CASE date {order} END, position LIMIT ?",
+                dates + dates + [limit]
+            ).fetchall()
+        return [json.loads(data) for data, in rows]
+    
+    def cleanup_old_files(self):
+        """清理过期文件，并删除超出每日数据保留期的记录"""
+        super().cleanup_old_files()
+        cutoff = (datetime.now() - timedelta(days=self.retention_policy['daily'])).strftime('%Y-%m-%d')
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM events WHERE date < ?", (cutoff,))
+            removed = self._conn.execute("DELETE FROM days WHERE date < ?", (cutoff,)).rowcount
+        if removed:
+            print(f"Deleted {removed} old daily records from {self.db_path}")
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class EventLogStorage(DataStorage):
+    """
+    追加写的每日事件日志：.techhorizon/daily/{date}.jsonl，每次运行追加
+    header、逐条 event 和 footer 记录，不重写已有内容。
+    upsert=True 时读取会按 event_id 合并当天多次运行（first_seen_at/last_seen_at 运行时间、最高热度、最新字段），
+    否则只读取最近一次完整运行。
+    """
+    
+    def __init__(self, base_dir: str = ".techhorizon", upsert: bool = True, compact_after: int = 8):
+        super().__init__(base_dir)
+        self.upsert = upsert
+        self.compact_after = compact_after  # 当天运行次数超过该值时把日志压缩为一次合并后的运行
+    
+    def daily_location(self, date: str) -> str:
+        return f"{self.base_dir}/daily/{date}.jsonl"
+    
+    def _write_run(self, f, date: str, data: Dict[str, Any], events: Iterable[Dict[str, Any]],
+                   compacted: bool = False):
+        run_id = uuid.uuid4().hex
+        collection_time = data.get('collection_time') or datetime.now().isoformat()
+        f.write(json.dumps({'record': 'header', 'run_id': run_id, 'date': date,
+                            'collection_time': collection_time, 'compacted': compacted},
+                           ensure_ascii=False) + '\n')
+        count = 0
+        for event in events:
+            f.write(json.dumps({'record': 'event', 'event': event}, ensure_ascii=False) + '\n')
+            count += 1
+        summary = {key: value for key, value in data.items() if key != 'events'}
+        summary.update({'record': 'footer', 'run_id': run_id, 'events_written': count})
+        f.write(json.dumps(summary, ensure_ascii=False) + '\n')
+    
+    def _write_daily_data(self, date: str, data: Dict[str, Any]):
+        """把本次运行追加到当天日志"""
+        file_path = self.daily_location(date)
+        with open(file_path, 'a', encoding='utf-8') as f:
+            self._write_run(f, date, data, data.get('events', []))
+        if self.upsert and self.compact_after and self._count_runs(date) > self.compact_after:
+            self.compact(date)
+    
+    def iter_records(self, date: str) -> Iterator[Dict[str, Any]]:
+        """逐行读取当天日志的原始记录，跳过写了一半的行"""
+        file_path = self.daily_location(date)
+        if not os.path.exists(file_path):
+            return
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+    
+    def _count_runs(self, date: str) -> int:
+        return sum(1 for record in self.iter_records(date) if record.get('record') == 'footer')
+    
+    @staticmethod
+    def _merge(merged: Dict[str, Dict[str, Any]], event: Dict[str, Any], seen_at: str):
+        key = event.get('event_id') or event.get('url')
+        previous = merged.pop(key, None)  # 重新插入，保持最近一次出现的顺序
+        event = dict(event)
+        if seen_at is None:
+            # 压缩后的记录自带合并好的 first_seen_at/last_seen_at
+            seen_at = event.get('last_seen_at')
+            first_seen_at = event.get('first_seen_at') or seen_at
+        else:
+            first_seen_at = seen_at
+        if previous is not None and previous.get('first_seen_at'):
+            first_seen_at = min(filter(None, (first_seen_at, previous['first_seen_at'])))
+        # 运行时间单独记录，不覆盖跨运行去重索引写入的 first_seen 日期
+        event['first_seen_at'] = first_seen_at
+        event['last_seen_at'] = seen_at
+        if previous is not None:
+            event['hotness_score'] = max(event.get('hotness_score', 0), previous.get('hotness_score', 0))
+        merged[key] = event
+    
+    def iter_events(self, date: str) -> Iterator[Dict[str, Any]]:
+        """
+        逐条产出当天的事件。upsert 模式下按 event_id 合并后产出（内存只保存当天的唯一事件）；
+        否则流式产出最近一次运行的事件。
+        """
+        if self.upsert:
+            merged = {}
+            seen_at = None
+            for record in self.iter_records(date):
+                if record.get('record') == 'header':
+                    seen_at = None if record.get('compacted') else record.get('collection_time')
+                elif record.get('record') == 'event':
+                    self._merge(merged, record['event'], seen_at)
+            yield from sorted(merged.values(), key=lambda x: x.get('hotness_score', 0), reverse=True)
+            return
+        
+        last_run = None
+        for record in self.iter_records(date):
+            if record.get('record') == 'footer':
+                last_run = record['run_id']
+        current_run = None
+        for record in self.iter_records(date):
+            if record.get('record') == 'header':
+                current_run = record['run_id']
+            elif record.get('record') == 'event' and current_run == last_run:
+                yield record['event']
+    
+    def _iter_events(self, dates: Iterable[str]):
+        for date in dates:
+            yield from self.iter_events(date)
+    
+    def _rollup_events(self, date: str, data: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """汇总基于当天合并后的全部事件"""
+        return self.iter_events(date)
+    
+    def load_daily_summary(self, date: str) -> Dict[str, Any]:
+        """最近一次完整运行的 footer 汇总（不含事件）"""
+        summary = {}
+        for record in self.iter_records(date):
+            if record.get('record') == 'footer':
+                summary = record
+        summary = {key: value for key, value in summary.items() if key not in ('record', 'run_id')}
+        return summary
+    
+    def load_daily_data(self, date: str) -> Dict[str, Any]:
+        """加载每日数据（汇总 + 事件列表）"""
+        daily_data = self.load_daily_summary(date)
+        events = list(self.iter_events(date))
+        if not daily_data and not events:
+            return {}
+        daily_data['events'] = events
+        if self.upsert:
+            daily_data['total_unique_events'] = len(events)
+        return daily_data
+    
+    def compact(self, date: str):
+        """把当天多次运行合并为一次运行重写日志（原子替换）"""
+        summary = self.load_daily_summary(date)
+        events = list(self.iter_events(date))
+        summary['total_unique_events'] = len(events)
+        file_path = self.daily_location(date)
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            self._write_run(f, date, summary, events, compacted=True)
+        os.replace(tmp_path, file_path)
+    
+    def get_all_daily_files(self) -> List[str]:
+        """获取所有每日事件日志"""
+        daily_dir = f"{self.base_dir}/daily"
+        if not os.path.exists(daily_dir):
+            return []
+        return [f for f in os.listdir(daily_dir) if f.endswith('.jsonl')]
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+TechHorizon 翻译后端模块
+可插拔的批量翻译接口、进程内模拟后端，以及用于离线测试的本地HTTP替身服务
+"""
+
+import json
+import time
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Iterable, Optional
+
+import requests
+
+from .translation_cache import TranslationCache
+
+# 简单的模拟翻译词典（实际应该调用翻译服务）
+MOCK_TRANSLATIONS = {
+    "Sample GitHub Project": "示例GitHub项目",
+    "This is a sample GitHub project description": "这是一个示例GitHub项目描述",
+    "Hacker News discussion": "Hacker News讨论",
+    "Artificial Intelligence": "人工智能",
+    "Machine Learning": "机器学习",
+    "Security vulnerability": "安全漏洞",
+    "New release": "新版本发布"
+}
+
+
+class TranslationBackend(ABC):
+    """翻译后端接口：一次翻译一批文本，按输入顺序返回译文"""
+    
+    # 缓存命名空间：后端标识及版本，译文质量变化时应更换
+    cache_namespace = 'backend'
+    
+    def is_placeholder(self, text: str, translated: str) -> bool:
+        """译文是否只是占位结果（不写入缓存）"""
+        return False
+
+    @abstractmethod
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        """翻译一批文本，返回与输入等长、顺序一致的译文列表"""
+
+
+class DictionaryBackend(TranslationBackend):
+    """进程内模拟后端，按词典替换，未命中时加 [翻译] 前缀"""
+    
+    cache_namespace = 'dictionary:v1'
+    PLACEHOLDER_PREFIX = '[翻译] '
+
+    def __init__(self, translations: Optional[Dict[str, str]] = None, latency: float = 0.0):
+        self.translations = translations or MOCK_TRANSLATIONS
+        self.latency = latency  # 模拟每次调用的往返耗时（秒）
+        self.calls = 0
+
+    def translate_one(self, text: str) -> str:
+        translated = text
+        for en, zh in self.translations.items():
+            translated = translated.replace(en, zh)
+
+        return translated if translated != text else f"{self.PLACEHOLDER_PREFIX}{text}"
+    
+    def is_placeholder(self, text: str, translated: str) -> bool:
+        return translated == f"{self.PLACEHOLDER_PREFIX}{text}"
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return [self.translate_one(text) for text in texts]
+
+
+class HTTPBackend(TranslationBackend):
+    """HTTP翻译后端：POST {"texts": [...]}，响应 {"translations": [...]}"""
+
+    def __init__(self, endpoint: str, timeout: float = 30, session: Optional[requests.Session] = None):
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.calls = 0
+        self.cache_namespace = f"http:{endpoint}"
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        self.calls += 1
+        response = self.session.post(self.endpoint, json={'texts': texts}, timeout=self.timeout)
+        response.raise_for_status()
+        translations = response.json().get('translations', [])
+        if len(translations) != len(texts):
+            raise ValueError(f"translation backend returned {len(translations)} results for {len(texts)} texts")
+        return translations
+
+
+class BatchTranslator:
+    """批量翻译器：先查缓存，未命中的文本去重后按批次并发交给后端"""
+
+    def __init__(self, backend: Optional[TranslationBackend] = None,
+                 cache: Optional[TranslationCache] = None,
+                 batch_size: int = 32, concurrency: int = 4):
+        self.backend = backend or DictionaryBackend()
+        self.cache = cache
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+
+    def _translate_batch(self, texts: List[str]) -> List[str]:
+        try:
+            return self.backend.translate_batch(texts)
+        except Exception as e:
+            # 后端失败时保留原文，不写入缓存
+            print(f"Error translating batch of {len(texts)} texts: {e}")
+            return [None] * len(texts)
+
+    def translate_many(self, texts: Iterable[str]) -> List[str]:
+        """翻译多条文本，按输入顺序返回；后端失败的条目返回原文"""
+        texts = list(texts)
+        results = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            cached = self.cache.get(text, self.backend.cache_namespace) if self.cache else None
+            if cached is None:
+                missing.append(text)
+            else:
+                results[text] = cached
+
+        batches = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+        if len(batches) <= 1 or self.concurrency == 1:
+            translated_batches = [self._translate_batch(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches))) as executor:
+                translated_batches = list(executor.map(self._translate_batch, batches))
+
+        for batch, translations in zip(batches, translated_batches):
+            for text, translated in zip(batch, translations):
+                if translated is None:
+                    results[text] = text
+                    continue
+                results[text] = translated
+                if self.cache and not self.backend.is_placeholder(text, translated):
+                    self.cache.put(text, translated, self.backend.cache_namespace)
+
+        return [results[text] for text in texts]
+
+    def translate(self, text: str) -> str:
+        return self.translate_many([text])[0]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """本地翻译服务替身的请求处理器"""
+
+    backend: TranslationBackend = DictionaryBackend()
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            texts = json.loads(self.rfile.read(length) or b'{}').get('texts', [])
+            body = json.dumps({'translations': self.backend.translate_batch(texts)},
+                              ensure_ascii=False).encode('utf-8')
+            self.send_response(200)
+        except (ValueError, AttributeError) as e:
+            body = json.dumps({'error': str(e)}).encode('utf-8')
+            self.send_response(400)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_stub(host: str = '127.0.0.1', port: int = 0,
+               backend: Optional[TranslationBackend] = None) -> ThreadingHTTPServer:
+    """在后台线程启动本地翻译服务替身，返回服务器对象（server_address 为实际监听地址）"""
+    handler = type('StubHandler', (_StubHandler,), {'backend': backend or DictionaryBackend()})
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, name='translation-stub', daemon=True)
+    thread.start()
+    return server
+
+
+def stub_endpoint(server: ThreadingHTTPServer) -> str:
+    """本地替身服务的翻译接口地址"""
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/translate"
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='TechHorizon 本地翻译服务替身')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8808)
+    parser.add_argument('--latency', type=float, default=0.0, help='模拟每批次的处理耗时（秒）')
+    args = parser.parse_args()
+
+    stub = serve_stub(args.host, args.port, DictionaryBackend(latency=args.latency))
+    print(f"Translation stub listening on {stub_endpoint(stub)}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stub.shutdown()
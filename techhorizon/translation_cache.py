@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+TechHorizon 翻译缓存模块
+按内容哈希缓存翻译结果：内存LRU + 持久化到 .techhorizon/cache 的SQLite，跨运行复用
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+
+class TranslationCache:
+    """
+    翻译缓存，磁盘条目数超过上限时按最近使用时间淘汰。
+    缓存键包含命名空间（翻译后端标识及版本），更换后端后不会复用其他后端的译文。
+    """
+
+    def __init__(self, path: str = ".techhorizon/cache/translations.db",
+                 memory_size: int = 2048, max_entries: int = 50000):
+        self.path = path
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._dirty = {}  # 待写入磁盘的 key -> (译文, 最近使用时间)
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @staticmethod
+    def key_for(text: str, namespace: str = '') -> str:
+        """命名空间 + 内容哈希作为缓存键"""
+        return hashlib.blake2b(f"{namespace}\0{text}".encode('utf-8'), digest_size=16).hexdigest()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None:
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS translations ("
+                    "key TEXT PRIMARY KEY, translation TEXT NOT NULL, last_used REAL NOT NULL)"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)"
+                )
+            except sqlite3.Error as e:
+                print(f"Translation cache unavailable: {e}")
+                self._conn = None
+        return self._conn
+
+    def _remember(self, key: str, translation: str):
+        self._memory[key] = translation
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, text: str, namespace: str = '') -> Optional[str]:
+        """查找译文，未命中返回None"""
+        key = self.key_for(text, namespace)
+        with self._lock:
+            translation = self._memory.get(key)
+            if translation is None:
+                conn = self._connection()
+                row = None
+                if conn is not None:
+                    row = conn.execute(
+                        "SELECT translation FROM translations WHERE key = ?", (key,)
+                    ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                translation = row[0]
+
+            self.hits += 1
+            self._remember(key, translation)
+            self._dirty[key] = (translation, time.time())
+            return translation
+
+    def put(self, text: str, translation: str, namespace: str = ''):
+        """写入译文（先写内存，save() 时落盘）"""
+        key = self.key_for(text, namespace)
+        with self._lock:
+            self._remember(key, translation)
+            self._dirty[key] = (translation, time.time())
+
+    def save(self):
+        """把新增和刚使用过的条目写入磁盘，并按条目数上限淘汰最久未使用的条目"""
+        with self._lock:
+            conn = self._connection()
+            if conn is None or not self._dirty:
+                return
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO translations (key, translation, last_used) VALUES (?, ?, ?)",
+                        [(key, translation, last_used) for key, (translation, last_used) in self._dirty.items()]
+                    )
+                    conn.execute(
+                        "DELETE FROM translations WHERE key IN ("
+                        "SELECT key FROM translations ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                        (self.max_entries,)
+                    )
+                self._dirty.clear()
+            except sqlite3.Error as e:
+                print(f"Failed to save translation cache: {e}")
+
+    def close(self):
+        """保存并关闭"""
+        self.save()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'memory_entries': len(self._memory),
+        }
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+TechHorizon HTTP传输层模块
+进程内共享的连接池会话，按主机配置连接池大小和TCP keep-alive
+"""
+
+import socket
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+# 使用更真实的浏览器User-Agent
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# 各主机的连接池大小（同时保持的连接数），并发请求多的主机需要更大的池
+DEFAULT_HOST_POOL_SIZES = {
+    'hacker-news.firebaseio.com': 16,
+    'github.com': 4,
+    'api.github.com': 4,
+    'www.oschina.net': 4,
+}
+
+
+def keepalive_socket_options(idle: int = 30, interval: int = 10, count: int = 3):
+    """在urllib3默认套接字选项基础上开启TCP keep-alive（平台不支持的选项自动跳过）"""
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    for name, value in (('TCP_KEEPIDLE', idle), ('TCP_KEEPINTVL', interval), ('TCP_KEEPCNT', count)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """带TCP keep-alive套接字选项的连接池适配器"""
+
+    def __init__(self, socket_options=None, **kwargs):
+        self.socket_options = socket_options or keepalive_socket_options()
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+class SessionManager:
+    """共享连接池管理器：同一主机的连接（含TLS握手结果）在所有收集器之间复用"""
+
+    def __init__(self, host_pool_sizes: Optional[Dict[str, int]] = None,
+                 default_pool_size: int = 4, max_hosts: int = 32):
+        self.host_pool_sizes = dict(DEFAULT_HOST_POOL_SIZES)
+        if host_pool_sizes:
+            self.host_pool_sizes.update(host_pool_sizes)
+        self.default_pool_size = default_pool_size
+        self.max_hosts = max_hosts
+        self.session = self._build_session()
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        session.headers.update(DEFAULT_HEADERS)
+
+        # 未单独配置的主机共用默认适配器，pool_connections 为缓存的主机连接池数量
+        default_adapter = KeepAliveAdapter(pool_connections=self.max_hosts,
+                                           pool_maxsize=self.default_pool_size)
+        session.mount('https://', default_adapter)
+        session.mount('http://', default_adapter)
+
+        for host, pool_size in self.host_pool_sizes.items():
+            adapter = KeepAliveAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount(f"https://{host}/", adapter)
+            session.mount(f"http://{host}/", adapter)
+
+        return session
+
+    def close(self):
+        """关闭所有连接"""
+        self.session.close()
+
+
+_default_manager = None
+_default_manager_lock = threading.Lock()
+
+
+def get_session_manager() -> SessionManager:
+    """获取进程内共享的连接池管理器"""
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            _default_manager = SessionManager()
+        return _default_manager
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+TechHorizon 链接处理模块
+链接规范化（去跟踪参数、解析相对链接、展开跳转链接）与跨运行稳定的事件指纹
+"""
+
+import hashlib
+import threading
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+from typing import Dict, Optional
+
+# 指纹密钥：固定值，保证不同进程、不同日期算出的指纹一致
+FINGERPRINT_KEY = b'techhorizon-event-v1'
+
+# 各协议的默认端口，规范化时去掉
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# 常见的跟踪参数，不影响页面内容
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    'spm', 'ref', 'ref_src', 'ref_url', '_hsenc', '_hsmi', 'mkt_tok', 'share_token',
+}
+TRACKING_PREFIXES = ('utm_',)
+
+# 查询参数都与内容无关的站点（如 https://juejin.cn/post/{id}?from=...），整体去掉查询串
+QUERYLESS_HOSTS = {'juejin.cn'}
+
+# 跳转链接：主机名 -> (路径, 目标链接所在的参数)
+REDIRECTORS = {
+    'link.juejin.cn': ('/', 'target'),
+    'link.zhihu.com': ('/', 'target'),
+    'www.oschina.net': ('/action/GoToLink', 'url'),
+    'www.google.com': ('/url', 'q'),
+    'l.facebook.com': ('/l.php', 'u'),
+    'out.reddit.com': (None, 'url'),
+}
+
+
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+class URLCanonicalizer:
+    """链接规范化器，结果按 (链接, 基准链接) 缓存，同一次运行中重复出现的链接只处理一次"""
+
+    def __init__(self, max_entries: int = 65536, max_unwrap: int = 3):
+        self.max_entries = max_entries
+        self.max_unwrap = max_unwrap  # 嵌套跳转链接最多展开的层数
+        self._memo: Dict[tuple, str] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, url: str, base: Optional[str] = None) -> str:
+        memo_key = (url, base)
+        canonical = self._memo.get(memo_key)
+        if canonical is None:
+            canonical = self._canonicalize(url, base)
+            with self._lock:
+                if len(self._memo) >= self.max_entries:
+                    self._memo.clear()
+                self._memo[memo_key] = canonical
+        return canonical
+
+    def clear(self):
+        with self._lock:
+            self._memo.clear()
+
+    def _canonicalize(self, url: str, base: Optional[str]) -> str:
+        url = absolute_url(url, base)
+        if not url:
+            return url
+
+        for _ in range(self.max_unwrap + 1):
+            normalized = self._normalize(url)
+            target = self._unwrap(normalized)
+            if not target:
+                return normalized
+            url = target
+        return normalized
+
+    @staticmethod
+    def _normalize(url: str) -> str:
+        """协议和主机名小写、去掉默认端口、跟踪参数和片段，查询参数排序，空路径补为 /"""
+        try:
+            parts = urlsplit(url)
+            port = parts.port
+        except ValueError:
+            return url
+        if not parts.scheme or not parts.netloc:
+            return url
+
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or '').lower()
+        if port and port != DEFAULT_PORTS.get(scheme):
+            host = f"{host}:{port}"
+        query = [] if host in QUERYLESS_HOSTS else sorted(
+            (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not is_tracking_param(name)
+        )
+        return urlunsplit((scheme, host, parts.path or '/', urlencode(query), ''))
+
+    @staticmethod
+    def _unwrap(url: str) -> Optional[str]:
+        """跳转链接返回其目标链接，否则返回None"""
+        parts = urlsplit(url)
+        redirector = REDIRECTORS.get(parts.hostname or '')
+        if not redirector:
+            return None
+        path, param = redirector
+        if path is not None and parts.path != path:
+            return None
+        for name, value in parse_qsl(parts.query):
+            if name == param and value.startswith(('http://', 'https://')):
+                return value
+        return None
+
+
+# 全局共享的规范化器
+url_canonicalizer = URLCanonicalizer()
+
+
+def absolute_url(url: str, base: Optional[str] = None) -> str:
+    """解析相对链接和无协议链接，其余部分保持原样（事件展示用的链接）"""
+    url = (url or '').strip()
+    if not url:
+        return url
+    if base:
+        return urljoin(base, url)
+    if url.startswith('//'):
+        return 'https:' + url
+    return url
+
+
+def canonicalize_url(url: str, base: Optional[str] = None) -> str:
+    """规范化链接；base 用于解析相对链接"""
+    return url_canonicalizer(url, base)
+
+
+def fingerprint(text: str, digest_size: int = 8) -> str:
+    """带密钥的 blake2b 摘要（十六进制），与内置 hash() 不同，跨进程稳定"""
+    return hashlib.blake2b(text.encode('utf-8'), key=FINGERPRINT_KEY,
+                           digest_size=digest_size).hexdigest()
+
+
+def event_id(url: str) -> str:
+    """事件ID：规范化链接的指纹"""
+    return fingerprint(canonicalize_url(url))
+
+
+def title_fingerprint(title: str) -> str:
+    """标题指纹：忽略大小写和多余空白"""
+    return fingerprint(' '.join(title.lower().split()))
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+收集器辅助函数测试
+"""
+
+import sys
+import os
+from datetime import datetime
+sys.path.insert(0, os.path.dirname(__file__))
+
+from techhorizon import collectors
+from techhorizon.collectors import datetime_to_iso, hacker_news_event
+from techhorizon.processor import DataProcessor
+from techhorizon.urls import event_id
+
+
+class PrePy311Datetime(datetime):
+    """模拟 Python 3.11 之前的 fromisoformat：不接受 Z 后缀"""
+
+    @classmethod
+    def fromisoformat(cls, text):
+        if text.endswith(('Z', 'z')):
+            raise ValueError(f"Invalid isoformat string: {text!r}")
+        return super().fromisoformat(text)
+
+
+def test_datetime_to_iso_normalizes_to_utc():
+    expected = '2024-05-12T08:30:00+00:00'
+    assert datetime_to_iso('2024-05-12T08:30:00Z') == expected
+    assert datetime_to_iso('2024-05-12T08:30:00.000Z') == expected
+    assert datetime_to_iso('2024-05-12T16:30:00+08:00') == expected
+    assert datetime_to_iso('2024-05-12 16:30:00') == expected  # 无时区按北京时间
+    assert datetime_to_iso(1715502600) == expected
+    assert datetime_to_iso(1715502600000) == expected
+    assert datetime_to_iso('not a date') is None
+    assert datetime_to_iso(None) is None
+
+
+def test_datetime_to_iso_accepts_z_suffix_before_python_311(monkeypatch):
+    """GitHub/ReadHub 的 Z 后缀时间在旧版本 Python 上也能解析"""
+    monkeypatch.setattr(collectors, 'datetime', PrePy311Datetime)
+    assert datetime_to_iso('2024-05-12T08:30:00Z') == '2024-05-12T08:30:00+00:00'
+    assert datetime_to_iso('2024-05-12T08:30:00.123Z') == '2024-05-12T08:30:00.123000+00:00'
+
+
+def test_event_url_keeps_original_link_and_event_id_uses_canonical_form():
+    """事件保留原始链接，去重用的 event_id 仍按规范化链接计算"""
+    story = {'id': 1, 'title': 'Docs', 'url': 'https://docs.example.com/guide?ref=hn#install', 'time': 0}
+    event = hacker_news_event(story)
+    assert event['url'] == 'https://docs.example.com/guide?ref=hn#install'
+    parsed = DataProcessor().parse_event(event)
+    assert parsed['url'] == event['url']
+    assert parsed['event_id'] == event_id('https://docs.example.com/guide')
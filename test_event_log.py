@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+JSONL 每日事件日志测试：同一天多次运行的合并与压缩
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+from techhorizon.storage import EventLogStorage
+
+DATE = '2026-01-05'
+
+
+def run(storage, time, *events):
+    storage.save_daily_data(DATE, {
+        'date': DATE,
+        'collection_time': f"{DATE}T{time}",
+        'total_events': len(events),
+        'events': [dict(event) for event in events],
+    })
+
+
+def event(event_id, score, title=None):
+    return {'event_id': event_id, 'title': title or event_id, 'url': f"https://example.com/{event_id}",
+            'source': 'hacker_news', 'primary_category': 'general', 'hotness_score': score}
+
+
+def test_upsert_merges_runs_by_event_id(tmp_path):
+    """多次运行按 event_id 合并：保留最高热度、最新字段和首次/最近出现的运行时间"""
+    storage = EventLogStorage(str(tmp_path), compact_after=0)
+    run(storage, '08:00:00', event('a', 50, 'old title'), event('b', 10))
+    run(storage, '12:00:00', event('a', 30, 'new title'), event('c', 70))
+
+    events = {item['event_id']: item for item in storage.iter_events(DATE)}
+    assert sorted(events) == ['a', 'b', 'c']
+    assert events['a']['hotness_score'] == 50
+    assert events['a']['title'] == 'new title'
+    assert events['a']['first_seen_at'] == f"{DATE}T08:00:00"
+    assert events['a']['last_seen_at'] == f"{DATE}T12:00:00"
+    assert events['b']['last_seen_at'] == f"{DATE}T08:00:00"
+    assert [item['event_id'] for item in storage.iter_events(DATE)] == ['c', 'a', 'b']
+    assert storage.load_daily_data(DATE)['total_unique_events'] == 3
+
+
+def test_dedup_first_seen_date_is_left_alone(tmp_path):
+    """跨运行去重索引写入的 first_seen 日期原样保留，与 JSON 后端一致"""
+    storage = EventLogStorage(str(tmp_path), compact_after=0)
+    seen = dict(event('a', 50), first_seen='2026-01-01', seen_before=True)
+    run(storage, '08:00:00', seen)
+    run(storage, '12:00:00', seen)
+    merged = list(storage.iter_events(DATE))[0]
+    assert merged['first_seen'] == '2026-01-01'
+    assert merged['first_seen_at'] == f"{DATE}T08:00:00"
+    assert merged['last_seen_at'] == f"{DATE}T12:00:00"
+
+
+def test_without_upsert_reads_latest_run_only(tmp_path):
+    storage = EventLogStorage(str(tmp_path), upsert=False)
+    run(storage, '08:00:00', event('a', 50), event('b', 10))
+    run(storage, '12:00:00', event('c', 70))
+    assert [item['event_id'] for item in storage.iter_events(DATE)] == ['c']
+
+
+def test_partial_trailing_line_is_ignored(tmp_path):
+    """写了一半的最后一行不影响读取"""
+    storage = EventLogStorage(str(tmp_path), compact_after=0)
+    run(storage, '08:00:00', event('a', 50))
+    with open(storage.daily_location(DATE), 'a', encoding='utf-8') as f:
+        f.write('{"record": "event", "event": {"event_id"')
+    assert [item['event_id'] for item in storage.iter_events(DATE)] == ['a']
+
+
+def test_compaction_preserves_merged_view(tmp_path):
+    """压缩后日志只剩一次运行，合并结果（含 first_seen_at/last_seen_at）不变，之后仍可继续追加"""
+    storage = EventLogStorage(str(tmp_path), compact_after=0)
+    run(storage, '08:00:00', event('a', 50), event('b', 10))
+    run(storage, '12:00:00', event('a', 30), event('c', 70))
+    before = list(storage.iter_events(DATE))
+
+    storage.compact(DATE)
+    assert storage._count_runs(DATE) == 1
+    assert list(storage.iter_events(DATE)) == before
+
+    run(storage, '18:00:00', event('b', 90))
+    events = {item['event_id']: item for item in storage.iter_events(DATE)}
+    assert events['a']['first_seen_at'] == f"{DATE}T08:00:00"
+    assert events['a']['last_seen_at'] == f"{DATE}T12:00:00"
+    assert events['b']['first_seen_at'] == f"{DATE}T08:00:00"
+    assert events['b']['last_seen_at'] == f"{DATE}T18:00:00"
+    assert events['b']['hotness_score'] == 90
+
+
+def test_compacts_automatically_after_threshold(tmp_path):
+    storage = EventLogStorage(str(tmp_path), compact_after=2)
+    for hour in range(3):
+        run(storage, f"{hour:02d}:00:00", event('a', hour))
+    assert storage._count_runs(DATE) == 1
+    assert [item['hotness_score'] for item in storage.iter_events(DATE)] == [2]
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+HTTP条件请求缓存测试
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(__file__))
+
+from techhorizon import collectors
+from techhorizon.collectors import BaseCollector
+from techhorizon.http_cache import HTTPCache
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b'', headers=None, encoding='utf-8'):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.encoding = encoding
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """按顺序返回预设响应，并记录每次请求的请求头"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, params=None, timeout=None, headers=None):
+        self.requests.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+def make_collector(cache, responses, monkeypatch):
+    monkeypatch.setattr(collectors.rate_limiter, 'wait', lambda url: None)
+    collector = BaseCollector('test', cache=cache)
+    collector.session = FakeSession(responses)
+    return collector
+
+
+def test_cache_key_uses_exact_request_url(tmp_path):
+    """缓存键按实际请求的URL区分，不做规范化"""
+    cache = HTTPCache(str(tmp_path))
+    assert cache.key_for('https://example.com/?ref=a') != cache.key_for('https://example.com/?ref=b')
+    assert cache.key_for('https://juejin.cn/post/1?page=1') != cache.key_for('https://juejin.cn/post/1?page=2')
+
+
+def test_cache_key_params_are_order_independent(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    assert cache.key_for('https://example.com/api', {'a': 1, 'b': 2}) == \
+        cache.key_for('https://example.com/api', {'b': 2, 'a': 1})
+    assert cache.key_for('https://example.com/api', {'a': 1}) != cache.key_for('https://example.com/api')
+
+
+def test_not_modified_serves_cached_body(tmp_path, monkeypatch):
+    """第二次请求带上校验值，304 时返回缓存的响应体并刷新校验时间"""
+    cache = HTTPCache(str(tmp_path))
+    collector = make_collector(cache, [
+        FakeResponse(200, b'<rss>v1</rss>', {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2026 00:00:00 GMT'}),
+        FakeResponse(304),
+    ], monkeypatch)
+    url = 'https://example.com/feed'
+
+    assert collector.fetch_content(url) == (b'<rss>v1</rss>', 'utf-8')
+    key = cache.key_for(url)
+    stored_at = cache.load(key)['stored_at']
+    time.sleep(0.01)
+
+    assert collector.fetch_content(url) == (b'<rss>v1</rss>', 'utf-8')
+    assert collector.session.requests == [
+        {}, {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 01 Jan 2026 00:00:00 GMT'}
+    ]
+    assert cache.load(key)['stored_at'] > stored_at
+
+
+def test_responses_without_validators_are_not_cached(tmp_path, monkeypatch):
+    cache = HTTPCache(str(tmp_path))
+    collector = make_collector(cache, [FakeResponse(200, b'a'), FakeResponse(200, b'b')], monkeypatch)
+    assert collector.fetch_content('https://example.com/x')[0] == b'a'
+    assert collector.fetch_content('https://example.com/x')[0] == b'b'
+    assert collector.session.requests == [{}, {}]
+    assert os.listdir(str(tmp_path)) == []
+
+
+def store(cache, url, size, age_days=0, last_used=None):
+    key = cache.key_for(url)
+    cache.store(key, url, FakeResponse(200, b'x' * size, {'ETag': url}))
+    meta = cache.load(key)
+    meta['stored_at'] = time.time() - age_days * 86400
+    meta['last_used'] = last_used if last_used is not None else meta['stored_at']
+    cache._write_meta(key, meta)
+    return key
+
+
+def test_evict_by_ttl_then_least_recently_used(tmp_path):
+    """先淘汰超过TTL的条目，再按最近使用时间淘汰到总大小上限以内，并清理孤立的响应体"""
+    cache = HTTPCache(str(tmp_path))
+    expired = store(cache, 'https://example.com/expired', 10, age_days=8)
+    oldest = store(cache, 'https://example.com/oldest', 100, last_used=time.time() - 30)
+    recent = store(cache, 'https://example.com/recent', 100, last_used=time.time() - 10)
+    newest = store(cache, 'https://example.com/newest', 100)
+    with open(os.path.join(str(tmp_path), 'orphan.body'), 'wb') as f:
+        f.write(b'orphan')
+
+    removed = cache.evict(ttl_days=7, max_bytes=250)
+    assert removed == 2
+    assert cache.load(expired) is None and cache.load(oldest) is None
+    assert cache.load(recent) is not None and cache.load(newest) is not None
+    assert not os.path.exists(os.path.join(str(tmp_path), 'orphan.body'))
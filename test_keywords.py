@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+KeywordAutomaton 匹配行为测试
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+from techhorizon.keywords import KeywordAutomaton
+from techhorizon.processor import DataProcessor
+
+
+def build(*keywords):
+    automaton = KeywordAutomaton()
+    for keyword in keywords:
+        automaton.add(keyword, keyword)
+    return automaton
+
+
+def test_ascii_keywords_require_word_boundaries():
+    """英文关键词两侧要求单词边界"""
+    automaton = build('go', 'ai')
+    assert automaton.search('Go 1.22 released') == {'go'}
+    assert automaton.search('a good idea') == set()
+    assert automaton.search('he said AI is here') == {'ai'}
+    assert automaton.search('gopher') == set()
+
+
+def test_plural_suffix_only_for_longer_keywords():
+    """4个字符以上的关键词允许复数后缀 s，短关键词不允许"""
+    automaton = build('release', 'new')
+    assert automaton.search('Releases for this week') == {'release'}
+    assert automaton.search('tech news') == set()
+    assert automaton.search('releasesx') == set()
+
+
+def test_cjk_keywords_match_as_substrings():
+    """中文关键词按子串匹配，与相邻英文字符无关"""
+    automaton = build('漏洞', '人工智能')
+    assert automaton.search('Windows严重漏洞修复') == {'漏洞'}
+    assert automaton.search('OpenAI发布人工智能模型') == {'人工智能'}
+
+
+def test_case_insensitive_and_overlapping_matches():
+    """大小写不敏感，重叠关键词全部命中"""
+    automaton = build('machine learning', 'learning', 'Rust')
+    assert automaton.search('MACHINE LEARNING in rust') == {'machine learning', 'learning', 'Rust'}
+
+
+def test_keywords_added_after_search_are_matched():
+    """搜索后再添加关键词会重新构建自动机"""
+    automaton = build('python')
+    assert automaton.search('python and kotlin') == {'python'}
+    automaton.add('kotlin', 'kotlin')
+    assert automaton.search('python and kotlin') == {'python', 'kotlin'}
+
+
+def test_common_suffixes_and_acronym_plurals():
+    """常见词尾变化和缩写复数仍能命中，短的普通词不放宽"""
+    automaton = build('release', 'vulnerability', 'launch', 'CVE', 'LLM', 'new', 'go')
+    assert automaton.search('Rust 1.80 released') == {'release'}
+    assert automaton.search('Critical vulnerabilities found in glibc') == {'vulnerability'}
+    assert automaton.search('Releasing soon, launched today') == {'release', 'launch'}
+    assert automaton.search('Three CVEs patched') == {'CVE'}
+    assert automaton.search('Open LLMs compared') == {'LLM'}
+    assert automaton.search('going newer') == set()
+
+
+def test_classification_regressions():
+    """关键词变化形式不丢失分类和事件类型"""
+    processor = DataProcessor()
+    cases = [
+        ('Rust 1.80 released', 'new_release', None),
+        ('Critical vulnerabilities found in glibc', None, 'security'),
+        ('Two CVEs disclosed in OpenSSH', 'security_alert', 'security'),
+        ('Benchmarking open LLMs', None, 'ai_ml'),
+    ]
+    for title, event_type, category in cases:
+        event = processor.classify_event({'title': title, 'description': ''})
+        if event_type:
+            assert event_type in event['event_types'], title
+        if category:
+            assert category in event['categories'], title
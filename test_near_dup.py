@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+近似重复合并测试
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+from techhorizon.near_dup import NearDuplicateDetector, MinHasher, clean_title, jaccard, numeric_tokens, shingles
+
+
+def make_event(title, source, score, url=None):
+    return {
+        'title': title,
+        'source': source,
+        'url': url or f"https://{source}.example.com/{title.lower().replace(' ', '-')}",
+        'hotness_score': score,
+    }
+
+
+TITLE = 'OpenAI releases GPT-5 with improved reasoning and coding'
+VARIANT = 'OpenAI releases GPT-5 with improved reasoning and coding skills'
+
+
+def test_minhash_estimates_jaccard():
+    """MinHash 签名的一致比例接近真实 Jaccard 相似度"""
+    hasher = MinHasher(num_perm=128)
+    a, b = shingles(TITLE), shingles(VARIANT)
+    exact = len(a & b) / len(a | b)
+    assert abs(jaccard(hasher.signature(TITLE), hasher.signature(VARIANT)) - exact) < 0.15
+
+
+def test_merge_keeps_highest_scored_copy_and_collects_sources():
+    """同一新闻的不同报道合并为一条，保留热度最高的并记录全部来源"""
+    low = make_event(TITLE, 'readhub', 40)
+    high = make_event(VARIANT, 'hacker_news', 90)
+    other = make_event('Rust 2.0 roadmap published by the core team', 'oschina', 60)
+    detector = NearDuplicateDetector()
+
+    result = detector.merge([low, other, high])
+
+    assert result == [high, other]
+    assert high['sources'] == ['hacker_news', 'readhub']
+    assert high['source_urls'] == [high['url'], low['url']]
+    assert high['duplicate_count'] == 1
+    assert detector.stats()['merged'] == 1
+
+
+def test_clean_title_strips_source_wrapper():
+    assert clean_title('[翻译] [AWS Blog] Amazon S3 adds tables（Amazon S3 adds tables）') == 'Amazon S3 adds tables'
+    assert clean_title('[CVE] Heap overflow in libpng') == 'Heap overflow in libpng'
+    assert clean_title('Kotlin 2.0（K2 编译器）') == 'Kotlin 2.0（K2 编译器）'
+    assert numeric_tokens('Go 1.23 is released, GPT-4o and CVE-2024-3094') == {'1.23', 'gpt-4o', 'cve-2024-3094'}
+
+
+def test_different_versions_are_not_merged():
+    """版本号/型号不同的标题即使字符高度相似也不合并"""
+    pairs = [
+        ('OpenAI announces GPT-5', 'OpenAI announces GPT-4o'),
+        ('Go 1.23 is released', 'Go 1.22 is released'),
+    ]
+    for first, second in pairs:
+        events = [make_event(first, 'hacker_news', 50), make_event(second, 'readhub', 40)]
+        assert len(NearDuplicateDetector().merge(events)) == 2
+
+
+def test_shared_wrapper_does_not_merge_different_posts():
+    """标签前缀和重复原文被去掉，不同文章不会因为相同的包装格式被合并"""
+    events = [
+        make_event('[翻译] [AWS Blog] Announcing Amazon Q Developer agents（Announcing Amazon Q Developer agents）',
+                   'tech_blogs', 50),
+        make_event('[翻译] [AWS Blog] Cost optimization for Amazon EKS（Cost optimization for Amazon EKS）',
+                   'hacker_news', 40),
+    ]
+    assert len(NearDuplicateDetector().merge(events)) == 2
+
+
+def test_same_source_is_never_merged():
+    """同一数据源的两个条目是不同新闻，即使标题几乎相同也都保留"""
+    events = [make_event(TITLE, 'hacker_news', 90), make_event(VARIANT, 'hacker_news', 40)]
+    detector = NearDuplicateDetector()
+    assert len(detector.merge(events)) == 2
+    assert detector.stats()['merged'] == 0
+
+
+def test_history_marks_repeats_from_earlier_days(tmp_path):
+    """之前某天出现过的近似新闻标记 near_duplicate_of，窗口外的历史被忽略"""
+    history_file = str(tmp_path / 'near_dup.json')
+    first = NearDuplicateDetector(history_file=history_file, today='2026-01-01')
+    first.merge([make_event(TITLE, 'readhub', 50, url='https://a.example.com/1')])
+    first.save()
+
+    second = NearDuplicateDetector(history_file=history_file, today='2026-01-02')
+    repeat = make_event(VARIANT, 'hacker_news', 70, url='https://b.example.com/2')
+    second.merge([repeat])
+    assert repeat['near_duplicate_of']['first_seen'] == '2026-01-01'
+
+    expired = NearDuplicateDetector(history_file=history_file, today='2026-03-01')
+    late = make_event(VARIANT, 'hacker_news', 70, url='https://b.example.com/3')
+    expired.merge([late])
+    assert 'near_duplicate_of' not in late
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+分阶段流水线测试
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.insert(0, os.path.dirname(__file__))
+
+from techhorizon.pipeline import Pipeline, Stage
+
+
+def test_single_worker_stages_preserve_order_and_count_drops():
+    """单线程阶段保持顺序；返回None的条目被丢弃并计数"""
+    pipeline = Pipeline([
+        Stage('double', lambda x: x * 2),
+        Stage('not_multiple_of_4', lambda x: x if x % 4 else None),
+    ])
+    results = []
+    stats = pipeline.run(range(10), results.append)
+    assert results == [2, 6, 10, 14, 18]
+    assert stats['source']['items'] == 10
+    assert stats['double']['processed'] == 10
+    assert stats['not_multiple_of_4'] == dict(stats['not_multiple_of_4'], processed=5, dropped=5, errors=0)
+
+
+def test_batch_stage_receives_lists():
+    batches = []
+
+    def batch(items):
+        batches.append(len(items))
+        return [item + 1 for item in items]
+
+    results = []
+    stats = Pipeline([Stage('batch', batch, batch_size=8, batch_wait=0.2)]).run(range(20), results.append)
+    assert results == list(range(1, 21))
+    assert max(batches) <= 8 and sum(batches) == 20
+    assert stats['batch']['processed'] == 20
+
+
+def test_multiple_workers_process_everything():
+    seen = set()
+    lock = threading.Lock()
+
+    def work(item):
+        with lock:
+            seen.add(threading.current_thread().name)
+        time.sleep(0.001)
+        return item
+
+    results = []
+    pipeline = Pipeline([Stage('work', work, workers=4), Stage('pass', lambda x: x, workers=2)])
+    pipeline.run(range(100), results.append)
+    assert sorted(results) == list(range(100))
+    assert len(seen) > 1
+
+
+def test_stage_and_source_errors_do_not_stall():
+    """阶段抛出异常时该条目计为错误；数据源异常时已读取的条目仍处理完并正常结束"""
+    def fail_on_three(item):
+        if item == 3:
+            raise ValueError("boom")
+        return item
+
+    def source():
+        yield from range(5)
+        raise RuntimeError("source broke")
+
+    results = []
+    stats = Pipeline([Stage('check', fail_on_three)]).run(source(), results.append)
+    assert results == [0, 1, 2, 4]
+    assert stats['check']['errors'] == 1
+    assert stats['source'] == {'items': 5, 'error': 'source broke'}
+
+
+def test_bounded_queues_apply_backpressure():
+    """下游处理慢时上游只会领先有限数量的条目"""
+    consumed = []
+    produced = []
+
+    def source():
+        for item in range(200):
+            produced.append(item)
+            yield item
+
+    def slow_sink(item):
+        consumed.append(item)
+        time.sleep(0.001)
+        # 源最多领先：两个阶段队列和结果队列的容量 + 两个阶段各正在处理的一条 + 输入线程手中的一条
+        assert len(produced) - len(consumed) <= 3 * 4 + 2 + 1
+
+    pipeline = Pipeline([Stage('a', lambda x: x, queue_size=4), Stage('b', lambda x: x, queue_size=4)])
+    pipeline.run(source(), slow_sink)
+    assert consumed == list(range(200))
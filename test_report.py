@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+有界Top-N测试
+"""
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(__file__))
+
+from techhorizon.report import TopN
+from techhorizon.storage import DataStorage
+
+
+def sorted_top(events, n):
+    """参照实现：稳定降序排序后取前 n 条"""
+    return sorted(events, key=lambda event: event.get('hotness_score', 0), reverse=True)[:n]
+
+
+def test_topn_matches_stable_sort_with_ties():
+    """大量同分事件时，结果与稳定排序取前 n 条完全一致（同分先加入的优先）"""
+    rng = random.Random(7)
+    events = [{'id': index, 'hotness_score': rng.randint(0, 5)} for index in range(500)]
+    for n in (1, 3, 50, 499, 500, 800):
+        top = TopN(n)
+        top.extend(events)
+        assert top.result() == sorted_top(events, n)
+        assert len(top) == min(n, len(events))
+
+
+def test_topn_missing_score_and_non_positive_size():
+    events = [{'id': 1}, {'id': 2, 'hotness_score': 3}, {'id': 3, 'hotness_score': 0}]
+    top = TopN(2)
+    top.extend(events)
+    assert [event['id'] for event in top.result()] == [2, 1]
+
+    empty = TopN(0)
+    empty.extend(events)
+    assert empty.result() == []
+
+
+def test_storage_top_events_beyond_rollup_size(tmp_path):
+    """超过汇总保留数量时流式扫描每日数据，结果与全量排序一致"""
+    storage = DataStorage(str(tmp_path))
+    dates = ['2026-01-02', '2026-01-01']
+    all_events = []
+    for day in dates:
+        events = [{'event_id': f"{day}-{index}", 'title': str(index),
+                   'url': f"https://example.com/{day}/{index}", 'source': 'readhub',
+                   'hotness_score': index % 7} for index in range(30)]
+        storage.save_daily_data(day, {'date': day, 'events': events})
+        all_events.extend(events)
+    assert storage.top_events(dates, 45) == sorted_top(all_events, 45)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+重试策略与熔断器测试
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+sys.path.insert(0, os.path.dirname(__file__))
+
+from techhorizon import resilience
+from techhorizon.resilience import CircuitBreaker, RetryPolicy
+
+
+class FakeResponse:
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+def test_backoff_doubles_and_is_capped():
+    """无抖动时按 base × 2^attempt 增长，不超过 max_delay"""
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0, jitter=0)
+    assert [policy.backoff(attempt) for attempt in range(5)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+
+def test_backoff_jitter_stays_within_bounds():
+    policy = RetryPolicy(base_delay=1.0, max_delay=10.0, jitter=0.5)
+    for _ in range(200):
+        assert 2.0 <= policy.backoff(2) <= 4.0
+
+
+def test_retry_after_seconds_and_http_date():
+    policy = RetryPolicy()
+    assert policy.retry_after(FakeResponse({'Retry-After': '7'})) == 7.0
+    assert policy.retry_after(FakeResponse({'Retry-After': '-3'})) == 0.0
+    assert policy.retry_after(FakeResponse()) is None
+    assert policy.retry_after(FakeResponse({'Retry-After': 'soon'})) is None
+
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = policy.retry_after(FakeResponse({'Retry-After': format_datetime(later, usegmt=True)}))
+    assert 25 <= delay <= 30
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    assert policy.retry_after(FakeResponse({'Retry-After': format_datetime(past, usegmt=True)})) == 0.0
+
+
+def test_delay_for_respects_attempts_and_retry_after_limit():
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0, jitter=0, max_retry_after=60)
+    assert policy.delay_for(0) == 1.0
+    assert policy.delay_for(1, FakeResponse({'Retry-After': '5'})) == 5.0
+    assert policy.delay_for(1, FakeResponse({'Retry-After': '120'})) is None  # 等待过久，放弃
+    assert policy.delay_for(2) is None  # 已用完重试次数
+    assert policy.is_retryable(503) and not policy.is_retryable(404)
+
+
+def test_circuit_breaker_open_half_open_and_cooldown_doubling(tmp_path, monkeypatch):
+    """closed → open → half_open → 试探失败重新 open（冷却翻倍、有上限）→ 成功后 closed"""
+    clock = FakeClock()
+    monkeypatch.setattr(resilience.time, 'time', clock.time)
+    breaker = CircuitBreaker(str(tmp_path / 'breakers.json'), failure_threshold=2,
+                             reset_timeout=100, max_reset_timeout=300)
+
+    breaker.record_failure('hn')
+    assert breaker.allow('hn') and breaker.states['hn']['state'] == 'closed'
+    breaker.record_failure('hn')
+    assert breaker.states['hn']['state'] == 'open'
+    assert not breaker.allow('hn')
+
+    clock.now += 100
+    assert breaker.allow('hn') and breaker.states['hn']['state'] == 'half_open'
+    breaker.record_failure('hn')
+    assert breaker.states['hn']['state'] == 'open'
+    assert breaker.states['hn']['cooldown'] == 200
+    clock.now += 199
+    assert not breaker.allow('hn')
+    clock.now += 1
+    assert breaker.allow('hn')
+    breaker.record_failure('hn')
+    assert breaker.states['hn']['cooldown'] == 300  # 不超过上限
+
+    clock.now += 300
+    assert breaker.allow('hn')
+    breaker.record_success('hn')
+    assert breaker.states['hn'] == {'state': 'closed', 'failures': 0, 'opened_at': None, 'cooldown': 100}
+
+
+def test_circuit_breaker_state_persists(tmp_path):
+    state_file = str(tmp_path / 'breakers.json')
+    breaker = CircuitBreaker(state_file, failure_threshold=1)
+    breaker.record_failure('readhub')
+    breaker.save()
+    assert not CircuitBreaker(state_file).allow('readhub')
+    assert CircuitBreaker(state_file).allow('oschina')
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+每日汇总与逐级合并测试
+"""
+
+import sys
+import os
+import shutil
+from datetime import date
+sys.path.insert(0, os.path.dirname(__file__))
+
+from techhorizon.rollup import HyperLogLog, Rollup, child_periods, period_days, period_for
+from techhorizon.storage import DataStorage
+
+
+def make_events(prefix, scores, category='ai_ml', source='hacker_news'):
+    return [{'event_id': f"{prefix}-{index}", 'title': f"{prefix} {index}",
+             'url': f"https://example.com/{prefix}/{index}", 'source': source, 'primary_category': category, 'event_types': ['new_release'],
+             'hotness_score': score} for index, score in enumerate(scores)]
+
+
+def test_hyperloglog_estimate_and_round_trip():
+    """稀疏和稠密两种序列化都能还原寄存器，估计误差在几个百分点内"""
+    for count in (100, 20000):
+        sketch = HyperLogLog()
+        for index in range(count):
+            sketch.add(f"event-{index}")
+        restored = HyperLogLog.from_str(sketch.to_str())
+        assert restored.registers == sketch.registers
+        assert abs(restored.count() - count) <= count * 0.05
+
+
+def test_merge_equals_rollup_of_all_events():
+    """合并两天的汇总与直接汇总两天的全部事件结果一致"""
+    day1 = make_events('a', [10, 50, 30])
+    day2 = make_events('b', [40, 50, 5], category='security', source='readhub')
+    merged = Rollup.merge_all('2026-01', [Rollup.from_events('2026-01-01', day1, top_k=4),
+                                          Rollup.from_events('2026-01-02', day2, top_k=4)],
+                              top_k=4, level='monthly')
+    direct = Rollup.from_events('2026-01', day1 + day2, top_k=4)
+
+    assert merged.total_events == direct.total_events == 6
+    assert merged.categories == direct.categories == {'ai_ml': 3, 'security': 3}
+    assert merged.sources == direct.sources
+    assert merged.event_types == {'new_release': 6}
+    assert merged.top_events == direct.top_events
+    assert [event['event_id'] for event in merged.top_events] == ['a-1', 'b-1', 'b-0', 'a-2']
+
+
+def test_distinct_events_counts_repeats_once():
+    """同一事件出现在多天时去重计数只算一次"""
+    rollups = [Rollup.from_events(f"2026-01-0{day}", make_events('same', [1, 2, 3])) for day in (1, 2)]
+    merged = Rollup.merge_all('2026-01', rollups, level='monthly')
+    assert merged.total_events == 6
+    assert merged.distinct_events() == 3
+
+
+def test_serialization_round_trip_and_legacy_event_ids():
+    rollup = Rollup.from_events('2026-01-01', make_events('a', [3, 1, 2]))
+    restored = Rollup.from_dict(rollup.to_dict())
+    assert restored.to_dict() == rollup.to_dict()
+    assert 'event_ids' not in rollup.to_dict()
+
+    legacy = Rollup.from_dict({'period': '2026-01-01', 'event_ids': ['x', 'y', 'z']})
+    assert legacy.distinct_events() == 3
+
+
+def test_load_rollup_backfills_without_writing(tmp_path):
+    """没有汇总文件的日期在内存中补建，读取不写磁盘"""
+    storage = DataStorage(str(tmp_path))
+    storage._write_daily_data('2026-01-01', {'date': '2026-01-01', 'events': make_events('a', [1, 2])})
+    rollup = storage.load_rollup('2026-01-01')
+    assert rollup.total_events == 2
+    assert not os.path.exists(storage._rollup_path('2026-01-01'))
+
+
+def test_period_helpers():
+    """月天数，以及各层级由哪一级合并而来"""
+    assert period_for('monthly', date(2025, 2, 3)) == '2025-02'
+    assert period_for('yearly', date(2025, 2, 3)) == '2025'
+    assert len(period_days('monthly', '2024-02')) == 29
+    assert len(period_days('yearly', '2024')) == 366
+    assert child_periods('monthly', '2025-02')[1][0] == '2025-02-01'
+    assert child_periods('yearly', '2025') == ('monthly', [f"2025-{month:02d}" for month in range(1, 13)])
+
+
+def save_day(storage, day, events):
+    storage.save_daily_data(day, {'date': day, 'total_events': len(events), 'events': events})
+
+
+def test_build_rollup_merges_levels_and_survives_expired_daily_data(tmp_path):
+    """月/年汇总逐级合并；已结束周期的汇总保存后，即使每日数据和每日汇总被清理仍可读取"""
+    storage = DataStorage(str(tmp_path))
+    save_day(storage, '2025-03-30', make_events('a', [10, 20]))
+    save_day(storage, '2025-03-31', make_events('b', [30]))
+    save_day(storage, '2025-04-01', make_events('c', [40, 5], category='security'))
+
+    april = storage.build_rollup('monthly', '2025-04')
+    assert [event['event_id'] for event in april.top_events] == ['c-0', 'c-1']
+
+    march = storage.build_rollup('monthly', '2025-03')
+    assert march.total_events == 3
+    yearly = storage.build_rollup('yearly', '2025')
+    assert yearly.total_events == 5
+    assert yearly.categories == {'ai_ml': 3, 'security': 2}
+    assert yearly.distinct_events() == 5
+
+    shutil.rmtree(tmp_path / 'daily')
+    shutil.rmtree(tmp_path / 'metadata' / 'rollups' / 'daily')
+    assert storage.build_rollup('yearly', '2025').to_dict() == yearly.to_dict()
+    assert storage.build_rollup('monthly', '2025-04').total_events == 2
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+热度评分测试
+"""
+
+import sys
+import os
+import copy
+import json
+import random
+sys.path.insert(0, os.path.dirname(__file__))
+
+from techhorizon import scoring
+from techhorizon.processor import DataProcessor
+from techhorizon.scoring import DEFAULT_WEIGHTS, FeatureMatrix, ScoringModel, load_weights
+
+SOURCES = ['github_trending', 'gitee_trending', 'hacker_news', 'readhub', 'oschina', 'juejin',
+           'security_vuln', 'tech_blogs']
+CATEGORIES = ['ai_ml', 'security', 'web_dev', 'cloud', 'general', 'major_announcement']
+EVENT_TYPES = ['security_alert', 'new_release', 'major_announcement', 'community_discussion']
+
+
+def legacy_hotness_score(event):
+    """重构前 DataProcessor.calculate_hotness_score 的实现"""
+    base_score = 0
+    source_weights = {'github_trending': 10, 'gitee_trending': 8, 'hacker_news': 12,
+                      'readhub': 6, 'oschina': 5, 'juejin': 5}
+    base_score += source_weights.get(event['source'], 1)
+    category_weights = {'security': 15, 'ai_ml': 12, 'major_announcement': 10}
+    if event.get('primary_category') in category_weights:
+        base_score += category_weights[event['primary_category']]
+    if 'security_alert' in event.get('event_types', []):
+        base_score += 20
+    return base_score
+
+
+def synthetic_events(count=500):
+    rng = random.Random(3)
+    return [{
+        'source': rng.choice(SOURCES),
+        'primary_category': rng.choice(CATEGORIES),
+        'event_types': rng.sample(EVENT_TYPES, rng.randint(1, 2)),
+        'points': rng.randint(0, 500),
+    } for _ in range(count)]
+
+
+def test_default_weights_match_legacy_formula():
+    """默认权重下逐条、批量、矩阵评分都与原公式一致（数值信号默认不参与）"""
+    events = synthetic_events()
+    expected = [legacy_hotness_score(event) for event in events]
+    model = ScoringModel()
+    processor = DataProcessor()
+    assert [model.score_one(event) for event in events] == expected
+    assert model.score(events) == expected
+    assert model.score_matrix(model.feature_matrix(events)) == expected
+    assert [processor.calculate_hotness_score(event) for event in events] == expected
+
+
+def test_matrix_rescoring_with_new_sources_and_categories():
+    """矩阵按列名映射权重：A/B 权重新增数据源、分类或数值信号也能直接重新评分"""
+    events = synthetic_events()
+    matrix = ScoringModel().feature_matrix(events)
+    weights = copy.deepcopy(DEFAULT_WEIGHTS)
+    weights['source']['tech_blogs'] = 7
+    weights['category']['cloud'] = 4
+    weights['event_type']['new_release'] = 3
+    weights['numeric']['points'] = 0.1
+    variant = ScoringModel(weights)
+    assert variant.score_matrix(matrix) == [variant.score_one(event) for event in events]
+
+
+def test_matrix_scoring_without_numpy(monkeypatch):
+    events = synthetic_events(50)
+    model = ScoringModel()
+    with_numpy = model.score_matrix(model.feature_matrix(events))
+    monkeypatch.setattr(scoring, 'np', None)
+    matrix = model.feature_matrix(events)
+    assert matrix.dense is None
+    assert model.score_matrix(matrix) == with_numpy
+    assert model.score_matrix(FeatureMatrix.from_events([])) == []
+
+
+def test_load_weights_overrides_sections(tmp_path):
+    path = tmp_path / 'weights.json'
+    path.write_text(json.dumps({'source': {'readhub': 9}, 'default_source': 2}), encoding='utf-8')
+    weights = load_weights(str(path))
+    assert weights['source']['readhub'] == 9
+    assert weights['source']['hacker_news'] == 12
+    assert weights['default_source'] == 2
+    assert load_weights(str(tmp_path / 'missing.json')) == DEFAULT_WEIGHTS
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+SQLite 存储后端测试
+"""
+
+import sys
+import os
+import shutil
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.dirname(__file__))
+
+from techhorizon.storage import DataStorage, SQLiteStorage
+
+
+def make_events(day, count):
+    categories = ['ai_ml', 'security', 'cloud']
+    return [{'event_id': f"{day}-{index}", 'title': f"事件 {index}",
+             'url': f"https://example.com/{day}/{index}", 'source': 'readhub', 'primary_category': categories[index % 3],
+             'hotness_score': index % 5} for index in range(count)]
+
+
+def fill(storage, dates):
+    for count, day in enumerate(dates, start=3):
+        storage.save_daily_data(day, {'date': day, 'total_events': count, 'events': make_events(day, count)})
+
+
+DATES = ['2026-01-03', '2026-01-02', '2026-01-01']
+
+
+def test_round_trip_and_replace(tmp_path):
+    """保存后原样读回；同一天再次保存整体替换"""
+    storage = SQLiteStorage(str(tmp_path))
+    fill(storage, DATES)
+    data = storage.load_daily_data('2026-01-01')
+    assert data['total_events'] == 5
+    assert data['events'] == make_events('2026-01-01', 5)
+
+    storage.save_daily_data('2026-01-01', {'date': '2026-01-01', 'events': make_events('2026-01-01', 1)})
+    assert len(storage.load_daily_data('2026-01-01')['events']) == 1
+    assert storage.load_daily_data('2025-12-31') == {}
+    assert storage.get_all_daily_files() == [f"{day}.json" for day in sorted(DATES)]
+    storage.close()
+
+
+def test_report_queries_match_file_backend(tmp_path):
+    """聚合查询的结果（含同分顺序）与文件后端一致"""
+    sqlite_storage = SQLiteStorage(str(tmp_path / 'sqlite'))
+    file_storage = DataStorage(str(tmp_path / 'json'))
+    fill(sqlite_storage, DATES)
+    fill(file_storage, DATES)
+
+    assert sqlite_storage.count_events(DATES) == file_storage.count_events(DATES) == 12
+    assert sqlite_storage.category_counts(DATES) == file_storage.category_counts(DATES)
+    for limit in (5, 12):
+        assert sqlite_storage.top_events(DATES, limit) == file_storage.top_events(DATES, limit)
+    sqlite_storage.close()
+
+
+def test_reports_are_answered_from_tables(tmp_path):
+    """报告统计直接查询 events 表，不依赖汇总文件"""
+    storage = SQLiteStorage(str(tmp_path))
+    fill(storage, DATES)
+    shutil.rmtree(tmp_path / 'metadata' / 'rollups')
+    assert storage.count_events(DATES) == 12
+    assert storage.category_counts(DATES[:1]) == {'ai_ml': 1, 'security': 1, 'cloud': 1}
+    assert len(storage.top_events(DATES, 3)) == 3
+    storage.close()
+
+
+def test_cleanup_removes_expired_days(tmp_path):
+    storage = SQLiteStorage(str(tmp_path))
+    old = (datetime.now() - timedelta(days=storage.retention_policy['daily'] + 1)).strftime('%Y-%m-%d')
+    today = datetime.now().strftime('%Y-%m-%d')
+    fill(storage, [today, old])
+    storage.cleanup_old_files()
+    assert storage.load_daily_data(old) == {}
+    assert storage.count_events([old]) == 0
+    assert storage.count_events([today]) == 3
+    storage.close()
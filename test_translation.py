@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+批量翻译测试
+"""
+
+import sys
+import os
+import threading
+sys.path.insert(0, os.path.dirname(__file__))
+
+from techhorizon.translation import (BatchTranslator, DictionaryBackend, HTTPBackend, TranslationBackend,
+                                     serve_stub, stub_endpoint)
+from techhorizon.translation_cache import TranslationCache
+
+
+class RecordingBackend(TranslationBackend):
+    """记录每批收到的文本，译文为大写"""
+
+    cache_namespace = 'recording:v1'
+
+    def __init__(self, fail_on=None):
+        self.batches = []
+        self.fail_on = fail_on
+        self._lock = threading.Lock()
+
+    def translate_batch(self, texts):
+        with self._lock:
+            self.batches.append(list(texts))
+        if self.fail_on in texts:
+            raise RuntimeError("backend down")
+        return [text.upper() for text in texts]
+
+
+def test_batches_deduplicate_and_keep_input_order():
+    backend = RecordingBackend()
+    translator = BatchTranslator(backend, batch_size=2, concurrency=3)
+    texts = ['a', 'b', 'a', 'c', 'd', 'e', 'b']
+    assert translator.translate_many(texts) == ['A', 'B', 'A', 'C', 'D', 'E', 'B']
+    assert sorted(text for batch in backend.batches for text in batch) == ['a', 'b', 'c', 'd', 'e']
+    assert max(len(batch) for batch in backend.batches) == 2
+    assert translator.translate_many([]) == []
+
+
+def test_cache_hits_skip_backend(tmp_path):
+    cache = TranslationCache(str(tmp_path / 'translations.db'))
+    backend = RecordingBackend()
+    translator = BatchTranslator(backend, cache, batch_size=8)
+    translator.translate_many(['hello', 'world'])
+    assert translator.translate_many(['world', 'hello', 'new']) == ['WORLD', 'HELLO', 'NEW']
+    assert backend.batches == [['hello', 'world'], ['new']]
+
+
+def test_failed_batch_returns_original_text_and_is_not_cached(tmp_path):
+    cache = TranslationCache(str(tmp_path / 'translations.db'))
+    backend = RecordingBackend(fail_on='bad')
+    translator = BatchTranslator(backend, cache, batch_size=2, concurrency=1)
+    assert translator.translate_many(['ok', 'bad', 'fine']) == ['ok', 'bad', 'FINE']
+    assert cache.get('ok', backend.cache_namespace) is None
+    assert cache.get('fine', backend.cache_namespace) == 'FINE'
+
+
+def test_placeholder_output_is_not_cached(tmp_path):
+    """模拟后端的占位译文不写入缓存，词典命中的译文写入"""
+    cache = TranslationCache(str(tmp_path / 'translations.db'))
+    backend = DictionaryBackend()
+    translator = BatchTranslator(backend, cache)
+    assert translator.translate_many(['Machine Learning', 'Unknown text']) == ['机器学习', '[翻译] Unknown text']
+    assert cache.get('Machine Learning', backend.cache_namespace) == '机器学习'
+    assert cache.get('Unknown text', backend.cache_namespace) is None
+
+
+def test_http_backend_against_stub_server():
+    server = serve_stub()
+    try:
+        backend = HTTPBackend(stub_endpoint(server), timeout=5)
+        translator = BatchTranslator(backend, batch_size=2)
+        assert translator.translate_many(['Machine Learning', 'Security vulnerability', 'AI']) == \
+            ['机器学习', '安全漏洞', '[翻译] AI']
+        assert backend.calls == 2
+    finally:
+        server.shutdown()
+        server.server_close()
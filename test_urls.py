@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+链接规范化与事件指纹测试
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+from techhorizon.urls import absolute_url, canonicalize_url, event_id, title_fingerprint
+
+
+def test_normalizes_scheme_host_port_and_fragment():
+    """协议和主机名小写、去掉默认端口和片段，空路径补为 /"""
+    assert canonicalize_url('HTTPS://Example.COM:443#top') == 'https://example.com/'
+    assert canonicalize_url('http://example.com:8080/a') == 'http://example.com:8080/a'
+
+
+def test_drops_tracking_params_and_sorts_query():
+    """去掉跟踪参数，其余查询参数排序"""
+    url = 'https://example.com/post?b=2&utm_source=x&a=1&fbclid=abc&ref=hn'
+    assert canonicalize_url(url) == 'https://example.com/post?a=1&b=2'
+
+
+def test_queryless_hosts_drop_whole_query():
+    assert canonicalize_url('https://juejin.cn/post/123?from=main_page') == 'https://juejin.cn/post/123'
+
+
+def test_resolves_relative_and_protocol_relative_links():
+    assert canonicalize_url('/item?id=1', base='https://news.example.com/list') == \
+        'https://news.example.com/item?id=1'
+    assert canonicalize_url('//cdn.example.com/a') == 'https://cdn.example.com/a'
+
+
+def test_unwraps_redirectors():
+    """展开跳转链接，目标链接同样规范化"""
+    wrapped = 'https://link.juejin.cn/?target=https%3A%2F%2FGitHub.com%2Fa%2Fb%3Futm_medium%3Dx'
+    assert canonicalize_url(wrapped) == 'https://github.com/a/b'
+
+
+def test_invalid_and_empty_urls_pass_through():
+    assert canonicalize_url('') == ''
+    assert canonicalize_url('not a url') == 'not a url'
+
+
+def test_absolute_url_only_resolves_relative_links():
+    """展示用链接只解析相对链接，保留 ref 参数和片段"""
+    assert absolute_url('/p/1?ref=home#comments', base='https://blog.example.com/feed') == \
+        'https://blog.example.com/p/1?ref=home#comments'
+    assert absolute_url('//cdn.example.com/a') == 'https://cdn.example.com/a'
+    assert absolute_url(' https://juejin.cn/post/1?from=main_page ') == 'https://juejin.cn/post/1?from=main_page'
+    assert absolute_url('') == ''
+
+
+def test_event_id_is_stable_across_url_variants():
+    """同一页面的不同写法得到相同的事件ID，不同页面不同"""
+    assert event_id('https://example.com/a?utm_source=x') == event_id('https://EXAMPLE.com/a#c')
+    assert event_id('https://example.com/a') != event_id('https://example.com/b')
+
+
+def test_title_fingerprint_ignores_case_and_spacing():
+    assert title_fingerprint('Rust 2.0  Released') == title_fingerprint('rust 2.0 released')